@@ -1,7 +1,93 @@
 """Main entry point for running the llama game."""
 
+import time
+
+INTERPRETER_CPU_SECONDS = time.process_time()
+
+import argparse
+import math
+from profiler import StartupTimer, process_age
+
+INTERPRETER_SECONDS = process_age()
+startup = StartupTimer(verbose=True)
+if INTERPRETER_SECONDS is not None:
+    startup.add("interpreter", INTERPRETER_SECONDS)
+else:
+    startup.add("interpreter (cpu)", INTERPRETER_CPU_SECONDS, counted=False)
+import pygame
+startup.mark("pygame import")
+import settings
 from game_v3 import Game
+startup.mark("game import")
+
+
+def window_size(text):
+    """Parse a WIDTHxHEIGHT window size."""
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT: {text}")
+    return width, height
+
+
+def render_scale(text):
+    """Parse a render scale: a finite number greater than 0 that leaves
+    frames at least one pixel across."""
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number: {text}")
+    if not (math.isfinite(value) and value > 0):
+        raise argparse.ArgumentTypeError(
+            f"must be a finite number greater than 0: {text}"
+        )
+    if min(settings.Settings(render_scale=value).render_size()) < 1:
+        raise argparse.ArgumentTypeError(f"too small to draw at: {text}")
+    return value
+
+
+def parse_args():
+    """Parse the quality preset and any individual overrides."""
+    parser = argparse.ArgumentParser(description="Play the llama game.")
+    parser.add_argument("--preset", choices=sorted(settings.PRESETS),
+                        default=settings.DEFAULT_PRESET,
+                        help="render-quality preset (default: %(default)s)")
+    parser.add_argument("--fps", type=int,
+                        help="target frame rate, 0 for uncapped")
+    parser.add_argument("--vsync", action=argparse.BooleanOptionalAction,
+                        help="wait for vertical blank when flipping")
+    parser.add_argument("--smooth-scaling",
+                        action=argparse.BooleanOptionalAction,
+                        help="smoothscale sprites instead of nearest")
+    parser.add_argument("--hud-hz", type=int,
+                        help="HUD text redraws per second, 0 for every frame")
+    parser.add_argument("--effects", action=argparse.BooleanOptionalAction,
+                        help="antialiased text")
+    parser.add_argument("--render-scale", type=render_scale,
+                        help="internal render resolution as a fraction of "
+                             "1000x720")
+    parser.add_argument("--integer-scaling",
+                        action=argparse.BooleanOptionalAction,
+                        help="upscale frames by whole multiples only")
+    parser.add_argument("--dirty-rects",
+                        action=argparse.BooleanOptionalAction,
+                        help="update only the changed areas during play")
+    parser.add_argument("--window", type=window_size,
+                        help="window size as WIDTHxHEIGHT")
+    parser.add_argument("--fullscreen", action="store_true", default=None,
+                        help="run fullscreen at the desktop resolution")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    game = Game()
+    args = parse_args()
+    settings.use_preset(
+        args.preset, fps=args.fps, vsync=args.vsync,
+        smooth_scaling=args.smooth_scaling, hud_hz=args.hud_hz,
+        effects=args.effects, render_scale=args.render_scale,
+        integer_scaling=args.integer_scaling,
+        dirty_rects=args.dirty_rects, window_size=args.window,
+        fullscreen=args.fullscreen
+    )
+    game = Game(startup=startup)
     game.run_game()
@@ -0,0 +1,118 @@
+"""Module containing the AssetManager, which loads each font, image and
+scaled image once per process and shares it between everything that
+draws."""
+
+import time
+import pygame
+from asset_pack import AssetPack
+
+
+class AssetManager:
+    """Caches fonts, images and scaled images by the arguments they were
+    made from, and counts cache hits, misses and time spent loading.
+
+    Images are converted to the display's pixel format when they are
+    loaded, so a display mode must be set before the first image is
+    requested. Images found in an opened asset pack are taken from it
+    instead of being decoded and scaled; when the pack's pixel layout
+    matches the display they are drawn straight from the mapped file
+    rather than copied.
+    """
+    def __init__(self):
+        """Start with an empty cache and zeroed statistics."""
+        self.pack = None
+        self.cache = {}
+        self.load_times = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, loader):
+        """Return the cached asset for key, calling loader to make it on
+        the first request."""
+        asset = self.cache.get(key)
+        if asset is not None:
+            self.hits += 1
+            return asset
+        self.misses += 1
+        start = time.perf_counter()
+        asset = loader()
+        self.load_times[key] = time.perf_counter() - start
+        self.cache[key] = asset
+        return asset
+
+    def open_pack(self, path):
+        """Use the asset pack at path for images from now on; return False
+        and carry on decoding images if it is missing or invalid."""
+        try:
+            self.pack = AssetPack(path)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def packed(self, path, alpha, size=None, smooth=False):
+        """Return an image from the asset pack in the display format, or
+        None if the pack does not hold it. The mapped surface is returned
+        as it is when it already matches the display, and converted into
+        a copy otherwise."""
+        if self.pack is None:
+            return None
+        surface = self.pack.surface(path, size, smooth)
+        if surface is None:
+            return None
+        display = pygame.display.get_surface()
+        has_alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+        if (has_alpha == alpha and display.get_bitsize() == 32
+                and display.get_masks()[:3] == surface.get_masks()[:3]):
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def font(self, path, size):
+        """Return the TTF font at path in the given point size."""
+        return self.get(
+            ("font", path, size), lambda: pygame.font.Font(path, size)
+        )
+
+    def image(self, path, alpha=True):
+        """Return the image at path converted to the display format, with
+        per-pixel alpha unless alpha is False."""
+        def load():
+            surface = self.packed(path, alpha)
+            if surface is not None:
+                return surface
+            surface = pygame.image.load(path)
+            return surface.convert_alpha() if alpha else surface.convert()
+        return self.get(("image", path, alpha), load)
+
+    def scaled(self, path, size, smooth=False, alpha=True):
+        """Return the image at path scaled to size, smoothly if smooth is
+        set; the unscaled image is cached too."""
+        def load():
+            surface = self.packed(path, alpha, size, smooth)
+            if surface is not None:
+                return surface
+            source = self.image(path, alpha)
+            if smooth:
+                return pygame.transform.smoothscale(source, size)
+            return pygame.transform.scale(source, size)
+        return self.get(("scaled", path, size, smooth, alpha), load)
+
+    def stats(self):
+        """Return the hit and miss counts, the number of cached assets and
+        the total load time in milliseconds."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "cached": len(self.cache),
+            "load_ms": sum(self.load_times.values()) * 1000,
+        }
+
+    def report(self):
+        """Return a one-line summary of the statistics."""
+        stats = self.stats()
+        return (
+            f"assets: {stats['cached']} cached, {stats['hits']} hits, "
+            f"{stats['misses']} misses, {stats['load_ms']:.1f} ms loading"
+        )
+
+
+assets = AssetManager()
@@ -0,0 +1,152 @@
+"""Module for building and reading the llama game's asset pack.
+
+The pack holds every image the game draws, already decoded and scaled,
+as raw pixel buffers behind a small JSON index, so loading an asset is
+a slice of a memory-mapped file instead of a PNG decode and a rescale.
+Pixels are stored as BGRA bytes, the layout of SDL's 32-bit ARGB
+display format on little-endian machines, so the game can draw straight
+from the mapping and every running copy shares the same pages:
+
+    b"LLAP" | version | index length (u32) | index | pixel buffers
+
+Build it after changing any image with:
+    python asset_pack.py
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import pygame
+from settings import (
+    BACKGROUND_PATH, CACTUS_PATH, ICON_PATH, LLAMA_FRAME_PATHS, PACK_PATH,
+    PRESETS, Settings
+)
+from simulation import LLAMA_SIZE, OBSTACLE_BASE_SIZE, OBSTACLE_SCALES
+
+MAGIC = b"LLAP"
+VERSION = 2
+ALIGN = 64
+
+
+def pack_key(path, size=None, smooth=False):
+    """Return the index key for an image, scaled to size if given."""
+    if size is None:
+        return path
+    filter_name = "smooth" if smooth else "nearest"
+    return f"{path}@{size[0]}x{size[1]}:{filter_name}"
+
+
+def build(path, variants):
+    """Decode and scale (path, size, smooth, alpha) variants and write
+    them to a pack at path; size None keeps the image unscaled."""
+    index = {}
+    buffers = []
+    offset = 0
+    for source, size, smooth, alpha in variants:
+        surface = pygame.image.load(source)
+        if size is not None:
+            if smooth:
+                surface = pygame.transform.smoothscale(surface, size)
+            else:
+                surface = pygame.transform.scale(surface, size)
+        if not alpha:
+            surface = pygame.image.frombytes(
+                pygame.image.tobytes(surface, "RGBX"), surface.get_size(),
+                "RGBX"
+            )
+        data = pygame.image.tobytes(surface, "BGRA")
+        index[pack_key(source, size, smooth)] = (
+            offset, surface.get_width(), surface.get_height(), alpha, source
+        )
+        padding = -len(data) % ALIGN
+        buffers.append(data + bytes(padding))
+        offset += len(data) + padding
+    header = json.dumps(index).encode("utf-8")
+    start = len(MAGIC) + 5 + len(header)
+    header += b" " * (-start % ALIGN)
+    with open(path, "wb") as f:
+        f.write(MAGIC + bytes([VERSION]) + struct.pack("<I", len(header)))
+        f.write(header)
+        for data in buffers:
+            f.write(data)
+    return len(index)
+
+
+class AssetPack:
+    """A memory-mapped asset pack that hands out surfaces backed directly
+    by its pixel buffers.
+
+    Entries whose source image is newer than the pack are treated as
+    missing, so a stale pack falls back to decoding rather than showing
+    old art.
+    """
+    def __init__(self, path=PACK_PATH):
+        """Map the pack at path and read its index, raising ValueError if
+        it is not a version 2 asset pack."""
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:4] != MAGIC or self.map[4] != VERSION:
+            self.map.close()
+            raise ValueError("Not a version 2 llama asset pack")
+        header_size, = struct.unpack_from("<I", self.map, 5)
+        self.data_start = 9 + header_size
+        self.index = json.loads(self.map[9:self.data_start])
+        self.built = os.path.getmtime(path)
+        self.view = memoryview(self.map)
+
+    def surface(self, path, size=None, smooth=False):
+        """Return a surface over the packed pixels for an image, or None
+        if the pack does not hold a current copy of it. Opaque images
+        have their alpha channel switched off so they blit as copies.
+
+        The surface keeps the mapping alive and must not be drawn on."""
+        entry = self.index.get(pack_key(path, size, smooth))
+        if entry is None:
+            return None
+        offset, width, height, alpha, source = entry
+        try:
+            if os.path.getmtime(source) > self.built:
+                return None
+        except OSError:
+            pass
+        start = self.data_start + offset
+        surface = pygame.image.frombuffer(
+            self.view[start:start + width * height * 4],
+            (width, height), "BGRA"
+        )
+        if not alpha:
+            surface.set_alpha(None)
+        return surface
+
+
+def game_variants():
+    """Return every (path, size, smooth, alpha) variant the game loads
+    under any preset: images at each preset's render scale, with the
+    llama frames scaled by both filters so overriding smooth_scaling
+    still finds them."""
+    variants = [(ICON_PATH, None, False, True)]
+    for preset in PRESETS:
+        preset_settings = Settings(preset)
+        scale = preset_settings.render_scale
+        variants.append(
+            (BACKGROUND_PATH, preset_settings.render_size(), False, False)
+        )
+        llama_size = round(LLAMA_SIZE * scale)
+        for path in LLAMA_FRAME_PATHS:
+            for smooth in (True, False):
+                variants.append(
+                    (path, (llama_size, llama_size), smooth, True)
+                )
+        for obstacle_scale in OBSTACLE_SCALES:
+            size = round(int(OBSTACLE_BASE_SIZE * obstacle_scale) * scale)
+            variants.append((CACTUS_PATH, (size, size), False, True))
+    return list(dict.fromkeys(variants))
+
+
+if __name__ == "__main__":
+    out_path = sys.argv[1] if len(sys.argv) > 1 else PACK_PATH
+    count = build(out_path, game_variants())
+    print(f"Wrote {count} images to {out_path} "
+          f"({os.path.getsize(out_path)} bytes)")
@@ -0,0 +1,240 @@
+"""Module containing a NumPy batched simulator that steps many llama games
+in lockstep."""
+
+import numpy as np
+from simulation import (
+    GROUND_Y, LLAMA_SIZE, OBSTACLE_BASE_SIZE, OBSTACLE_FLOOR,
+    OBSTACLE_SCALES, SPAWN_X, TICKS_PER_SECOND
+)
+
+LLAMA_X = 200
+LLAMA_SHRINK = int(LLAMA_SIZE * 0.3)
+LLAMA_BOX_LEFT = LLAMA_X + LLAMA_SHRINK // 2
+LLAMA_BOX_SIZE = LLAMA_SIZE - LLAMA_SHRINK
+SIZES = np.array(
+    [int(OBSTACLE_BASE_SIZE * s) for s in OBSTACLE_SCALES], dtype=float
+)
+MIN_GAPS = np.array([int(180 + 30 * s) for s in OBSTACLE_SCALES])
+
+
+class BatchSimulation:
+    """Runs N independent llama games as a struct of arrays, advancing all
+    of them with one step() call.
+
+    The rules match simulation.Simulation tick for tick; only the random
+    stream differs, since every game draws from one NumPy generator.
+    Finished games are frozen until they are reset.
+    """
+    def __init__(self, n, seed=None, capacity=8):
+        """Allocate state for n games with room for capacity obstacles
+        each; the obstacle arrays grow if a game ever needs more."""
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.llama_y = np.zeros(n, dtype=np.int64)
+        self.velocity = np.zeros(n, dtype=np.int64)
+        self.is_jumping = np.zeros(n, dtype=bool)
+        self.obstacle_x = np.full((n, capacity), np.inf)
+        self.obstacle_size = np.zeros((n, capacity))
+        self.obstacle_speed_slot = np.zeros((n, capacity))
+        self.obstacle_alive = np.zeros((n, capacity), dtype=bool)
+        self.spawn_timer = np.zeros(n, dtype=np.int64)
+        self.spawn_interval = np.zeros(n, dtype=np.int64)
+        self.difficulty_timer = np.zeros(n, dtype=np.int64)
+        self.obstacle_speed = np.zeros(n)
+        self.ticks_survived = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.final_seconds = np.zeros(n)
+        self.death_size = np.zeros(n, dtype=np.int64)
+        self.min_spawn_interval = 40
+        self.max_obstacle_speed = 11
+        self.reset()
+
+    def reset(self, mask=None):
+        """Reset the games selected by a boolean mask, or all games."""
+        if mask is None:
+            mask = np.ones(self.n, dtype=bool)
+        idx = np.flatnonzero(mask)
+        self.llama_y[idx] = GROUND_Y
+        self.velocity[idx] = 0
+        self.is_jumping[idx] = False
+        self.obstacle_alive[idx] = False
+        self.obstacle_x[idx] = np.inf
+        self.obstacle_speed_slot[idx] = 0.0
+        for i in range(2):
+            sizes = SIZES[self.rng.integers(0, len(SIZES), idx.size)]
+            self.obstacle_x[idx, i] = SPAWN_X + i * 300
+            self.obstacle_size[idx, i] = sizes
+            self.obstacle_speed_slot[idx, i] = 5
+            self.obstacle_alive[idx, i] = True
+        self.spawn_timer[idx] = 0
+        self.spawn_interval[idx] = 120
+        self.difficulty_timer[idx] = 0
+        self.obstacle_speed[idx] = 5
+        self.ticks_survived[idx] = 0
+        self.game_over[idx] = False
+        self.final_seconds[idx] = 0.0
+        self.death_size[idx] = 0
+
+    def step(self, jump_mask):
+        """Advance every running game by one tick and return a boolean
+        array of the games that hit an obstacle during it."""
+        active = ~self.game_over
+        start = active & np.asarray(jump_mask, dtype=bool) & ~self.is_jumping
+        self.is_jumping |= start
+        self.velocity[start] = -15
+
+        falling = active & self.is_jumping
+        self.velocity[falling] += 1
+        self.llama_y[falling] += self.velocity[falling]
+        landed = falling & (self.llama_y >= GROUND_Y)
+        self.llama_y[landed] = GROUND_Y
+        self.is_jumping[landed] = False
+
+        self.obstacle_x -= self.obstacle_speed_slot
+        culled = self.obstacle_x <= -self.obstacle_size
+        if culled.any():
+            self.obstacle_x[culled] = np.inf
+            self.obstacle_speed_slot[culled] = 0.0
+            self.obstacle_alive[culled] = False
+
+        self.difficulty_timer[active] += 1
+        ramp = active & (self.difficulty_timer % 90 == 0)
+        if ramp.any():
+            self.ramp_difficulty(ramp)
+
+        self.spawn_timer[active] += 1
+        spawning = active & (self.spawn_timer >= self.spawn_interval)
+        if spawning.any():
+            self.spawn_timer[spawning] = 0
+            self.spawn_obstacles(np.flatnonzero(spawning))
+
+        hit = self.check_collision(active)
+        self.game_over |= hit
+        self.obstacle_speed_slot[hit] = 0.0
+        self.final_seconds[hit] = np.round(
+            self.ticks_survived[hit] / TICKS_PER_SECOND, 1
+        )
+        self.ticks_survived[active] += 1
+        return hit
+
+    def ramp_difficulty(self, ramp):
+        """Shorten the spawn interval and speed up obstacles in the games
+        selected by ramp."""
+        shorten = ramp & (self.spawn_interval > self.min_spawn_interval)
+        self.spawn_interval[shorten] -= 2
+        faster = ramp & (self.obstacle_speed < self.max_obstacle_speed)
+        self.obstacle_speed[faster] = np.minimum(
+            self.obstacle_speed[faster] + 0.4, self.max_obstacle_speed
+        )
+        self.obstacle_speed_slot[ramp] = np.where(
+            self.obstacle_alive[ramp], self.obstacle_speed[ramp, None], 0.0
+        )
+
+    def spawn_obstacles(self, idx):
+        """Spawn a single obstacle or a group of obstacles off screen in
+        each of the games listed in idx."""
+        rng = self.rng
+        count = idx.size
+        alive_x = np.where(
+            self.obstacle_alive[idx], self.obstacle_x[idx], -np.inf
+        )
+        last_x = alive_x.max(axis=1)
+        last_x[np.isneginf(last_x)] = 0
+        base_x = np.maximum(SPAWN_X, last_x + 220)
+
+        grouped = rng.random(count) < 0.25
+        group_size = np.where(grouped, rng.integers(2, 5, count), 1)
+        scale_idx = rng.integers(0, len(SIZES), count)
+        sizes = SIZES[scale_idx]
+        min_gap = MIN_GAPS[scale_idx]
+        gaps = min_gap[:, None] + rng.integers(0, 61, (count, 4))
+        offsets = np.arange(4) * gaps
+
+        needed = int(group_size.max())
+        free = (~self.obstacle_alive[idx]).sum(axis=1)
+        if (free < group_size).any():
+            self.grow(self.obstacle_alive.shape[1] + needed)
+        for i in range(needed):
+            rows = idx[group_size > i]
+            pick = group_size > i
+            slots = np.argmin(self.obstacle_alive[rows], axis=1)
+            self.obstacle_x[rows, slots] = base_x[pick] + offsets[pick, i]
+            self.obstacle_size[rows, slots] = sizes[pick]
+            self.obstacle_speed_slot[rows, slots] = self.obstacle_speed[rows]
+            self.obstacle_alive[rows, slots] = True
+
+        variation = rng.integers(-20, 21, count)
+        self.spawn_interval[idx] = np.maximum(
+            self.min_spawn_interval, self.spawn_interval[idx] + variation
+        )
+
+    def grow(self, capacity):
+        """Widen the per-game obstacle arrays to hold capacity slots."""
+        extra = capacity - self.obstacle_alive.shape[1]
+        if extra <= 0:
+            return
+        self.obstacle_x = np.pad(
+            self.obstacle_x, ((0, 0), (0, extra)), constant_values=np.inf
+        )
+        self.obstacle_size = np.pad(self.obstacle_size, ((0, 0), (0, extra)))
+        self.obstacle_speed_slot = np.pad(
+            self.obstacle_speed_slot, ((0, 0), (0, extra))
+        )
+        self.obstacle_alive = np.pad(
+            self.obstacle_alive, ((0, 0), (0, extra))
+        )
+
+    def check_collision(self, active):
+        """Return a boolean array of running games whose llama hitbox
+        overlaps an obstacle hitbox, recording the obstacle that hit."""
+        # The llama never leaves its x column, so only obstacles near it
+        # need the exact hitbox test.
+        near = (self.obstacle_x < LLAMA_BOX_LEFT + LLAMA_BOX_SIZE) & (
+            self.obstacle_x + self.obstacle_size > LLAMA_BOX_LEFT
+        )
+        rows, slots = np.nonzero(near & active[:, None])
+        hit = np.zeros(self.n, dtype=bool)
+        if rows.size == 0:
+            return hit
+        size = self.obstacle_size[rows, slots]
+        x = self.obstacle_x[rows, slots]
+        shrink = size // 2
+        box_size = size - shrink
+        box_x = np.trunc(x + shrink // 2)
+        box_y = OBSTACLE_FLOOR - size + shrink // 2
+        llama_top = self.llama_y[rows] + LLAMA_SHRINK // 2
+        overlap = (
+            (LLAMA_BOX_LEFT < box_x + box_size)
+            & (box_x < LLAMA_BOX_LEFT + LLAMA_BOX_SIZE)
+            & (llama_top < box_y + box_size)
+            & (box_y < llama_top + LLAMA_BOX_SIZE)
+        )
+        if overlap.any():
+            # Obstacles are checked front to back, so the leftmost
+            # overlapping one is the one that hit.
+            rows, x, size = rows[overlap], x[overlap], size[overlap]
+            order = np.lexsort((-x, rows))
+            self.death_size[rows[order]] = size[order]
+            hit[rows] = True
+        return hit
+
+    def next_obstacle_distance(self):
+        """Return, per game, the distance from the llama's hitbox to the
+        nearest obstacle that has not yet passed it (inf if none)."""
+        ahead = self.obstacle_x + self.obstacle_size > LLAMA_BOX_LEFT
+        return self.obstacle_x.min(
+            axis=1, where=ahead, initial=np.inf
+        ) - LLAMA_BOX_LEFT
+
+    def seconds_survived(self):
+        """Return the number of seconds survived by each game."""
+        return self.ticks_survived / TICKS_PER_SECOND
+
+    def run(self, policy, max_ticks):
+        """Step until every game is over or max_ticks have passed, asking
+        policy(batch) for the jump mask on each tick."""
+        for _ in range(max_ticks):
+            if self.game_over.all():
+                break
+            self.step(policy(self))
+        return self.ticks_survived
@@ -0,0 +1,6 @@
+"""Benchmarks for the llama game, run headlessly under the SDL dummy video
+driver with an uncapped clock.
+
+Run the whole suite from the repository root with:
+    python -m benchmarks
+"""
@@ -0,0 +1,42 @@
+"""Command line entry point for the benchmark suite."""
+
+import argparse
+import os
+import settings
+from benchmarks.harness import load_baseline, report, save_baseline
+from benchmarks.suite import run_suite
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    """Run the suite, compare it with the baseline and optionally save."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the llama game loop headlessly."
+    )
+    parser.add_argument("--baseline",
+                        default=os.path.join(ROOT, "benchmarks",
+                                             "baseline.json"),
+                        help="JSON file to compare against")
+    parser.add_argument("--save", action="store_true",
+                        help="store this run as the new baseline")
+    parser.add_argument("--scale", type=float, default=1,
+                        help="multiply the iteration counts")
+    parser.add_argument("--preset", choices=sorted(settings.PRESETS),
+                        default=settings.DEFAULT_PRESET,
+                        help="render-quality preset to run the game at")
+    args = parser.parse_args()
+    settings.use_preset(args.preset)
+
+    os.chdir(ROOT)
+    baseline = load_baseline(args.baseline)
+    results = run_suite(args.scale)
+    report(results, baseline)
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
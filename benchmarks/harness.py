@@ -0,0 +1,83 @@
+"""Module containing the timing harness and JSON baseline handling used by
+the benchmark suite."""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+
+def measure(name, func, ops, unit="ops", alloc_samples=200):
+    """Call func ops times and return its throughput and allocation stats.
+
+    peak_bytes is the mean transient Python allocation per call, taken
+    from tracemalloc over alloc_samples extra calls; net_blocks is the
+    growth in allocated blocks per call, which should be zero in a steady
+    state.
+    """
+    ops = max(1, int(ops))
+    func()
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter()
+    for _ in range(ops):
+        func()
+    elapsed = time.perf_counter() - start
+    net_blocks = (sys.getallocatedblocks() - blocks) / ops
+
+    tracemalloc.start()
+    peak_total = 0
+    for _ in range(alloc_samples):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func()
+        peak_total += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+
+    return {
+        "name": name,
+        "unit": unit,
+        "per_sec": ops / elapsed,
+        "us_per_op": elapsed / ops * 1e6,
+        "peak_bytes": peak_total / alloc_samples,
+        "net_blocks": net_blocks,
+    }
+
+
+def load_baseline(path):
+    """Return the results stored at path keyed by name, or {} if none."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return {r["name"]: r for r in json.load(f)["results"]}
+
+
+def save_baseline(path, results):
+    """Store results at path as the new baseline."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            "results": results,
+        }, f, indent=2)
+
+
+def report(results, baseline):
+    """Print results, with the throughput change against baseline."""
+    print(
+        f"{'benchmark':<26}{'rate':>16}{'us/op':>10}"
+        f"{'peak B':>10}{'blocks':>8}{'vs base':>10}"
+    )
+    for r in results:
+        old = baseline.get(r["name"])
+        change = (
+            f"{(r['per_sec'] / old['per_sec'] - 1) * 100:+.1f}%"
+            if old else "-"
+        )
+        print(
+            f"{r['name']:<26}{r['per_sec']:>10,.0f} {r['unit']:<5}"
+            f"{r['us_per_op']:>10.1f}{r['peak_bytes']:>10.0f}"
+            f"{r['net_blocks']:>8.2f}{change:>10}"
+        )
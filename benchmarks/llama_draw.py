@@ -0,0 +1,56 @@
+"""Benchmark comparing the llama's per-frame smoothscale draw with the
+cached, pre-scaled frames.
+
+Run from the repository root with:
+    python -m benchmarks.llama_draw
+"""
+
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from llama_v3 import Llama, FRAME_PATHS
+
+
+def time_frames(draw, frames):
+    """Return the mean cost of draw() in microseconds over frames calls."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw()
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main(frames=5000):
+    """Time both draw paths and print the per-frame cost of each."""
+    pygame.init()
+    screen = pygame.display.set_mode((1000, 720))
+    llama = Llama(200, 500)
+    sources = [
+        pygame.image.load(path).convert_alpha() for path in FRAME_PATHS
+    ]
+
+    def draw_smoothscale():
+        llama.update()
+        screen.blit(
+            pygame.transform.smoothscale(
+                sources[llama.current_frame], (80, 80)
+            ),
+            (llama.x, llama.y)
+        )
+
+    def draw_cached():
+        llama.update()
+        llama.draw(screen)
+
+    before = time_frames(draw_smoothscale, frames)
+    after = time_frames(draw_cached, frames)
+    print(f"smoothscale per frame: {before:8.1f} us")
+    print(f"cached frames:         {after:8.1f} us")
+    print(f"speedup:               {before / after:8.1f}x")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Module defining the benchmark cases for the game loop and its pieces."""
+
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import settings
+from benchmarks.harness import measure
+from simulation import Simulation
+
+
+def make_game():
+    """Create a Game with an uncapped clock that jumps on its own; runs
+    are not recorded, so nothing is written to the leaderboard."""
+    from game_v3 import Game
+    game = Game(fps=0)
+    game.initialize_game()
+    game.show_start = False
+    game.handle_input = lambda: game.sim.next_obstacle_distance() < 60
+    game.sim.rng = random.Random(0)
+    return game
+
+
+def restart_if_over(game):
+    """Start a new run if the last one ended."""
+    if game.game_over:
+        game.game_over = False
+        game.paused = False
+        game.sim.reset()
+
+
+def play_frame(game):
+    """Draw and show one frame of play, restarting if the run ended."""
+    restart_if_over(game)
+    game.update_game(game.background)
+    game.show_frame()
+    game.clock.tick(game.fps)
+
+
+def bench_simulation(scale):
+    """Headless Simulation.step with a distance-threshold policy."""
+    sim = Simulation(rng=random.Random(0))
+
+    def step():
+        if sim.game_over:
+            sim.reset()
+        sim.step(sim.next_obstacle_distance() < 60)
+    return [measure("simulation_step", step, 200000 * scale, "ticks")]
+
+
+def bench_batch(scale):
+    """BatchSimulation.step over 1000 games, counted in game-ticks."""
+    try:
+        from batch_simulation import BatchSimulation
+    except ImportError:
+        return []
+    batch = BatchSimulation(1000, seed=0)
+
+    def step():
+        batch.reset(batch.game_over)
+        batch.step(batch.next_obstacle_distance() < 60)
+    result = measure("batch_step_1000", step, 500 * scale, "steps")
+    result["per_sec"] *= batch.n
+    result["unit"] = "ticks"
+    return [result]
+
+
+def bench_pieces(game, scale):
+    """Llama.update/draw and Obstacle spawning on their own."""
+    from llama_v3 import Llama
+    from obstacle_v3 import Obstacle
+    screen = game.screen
+    llama = Llama(200, 500)
+
+    def draw_llama():
+        llama.update()
+        llama.draw(screen)
+
+    def spawn_obstacle():
+        Obstacle(1000, 0, random.choice([1, 0.9, 0.8, 0.7, 0.6]), 5)
+    return [
+        measure("llama_update", llama.update, 200000 * scale, "calls"),
+        measure("llama_draw", draw_llama, 20000 * scale, "calls"),
+        measure("obstacle_spawn", spawn_obstacle, 20000 * scale, "calls"),
+    ]
+
+
+def bench_frames(game, scale):
+    """Whole frames: update_game with and without dirty rects, the pause
+    screen and the start screen, each followed by show_frame, then a
+    restart through start_run and its first frame. The screens are timed
+    both shown from their cache and composed from scratch."""
+    bg = game.background
+
+    def game_frame():
+        play_frame(game)
+
+    def pause_frame():
+        game.overlay_shown = False
+        game.draw_pause_screen(bg)
+        game.show_frame()
+        game.clock.tick(game.fps)
+
+    def start_frame():
+        game.overlay_shown = False
+        game.draw_start_screen(bg)
+        game.show_frame()
+        game.clock.tick(game.fps)
+
+    def compose(frame):
+        def composed_frame():
+            game.overlay_key = None
+            frame()
+        return composed_frame
+
+    results = [measure("update_game", game_frame, 3000 * scale, "fps")]
+    dirty_rects = game.settings.dirty_rects
+    game.settings.dirty_rects = False
+    results.append(
+        measure("update_game_full_redraw", game_frame, 3000 * scale, "fps")
+    )
+    game.settings.dirty_rects = dirty_rects
+    game.paused = True
+    results.append(
+        measure("draw_pause_screen", pause_frame, 3000 * scale, "fps")
+    )
+    results.append(measure(
+        "draw_pause_screen_compose", compose(pause_frame), 300 * scale, "fps"
+    ))
+    game.paused = False
+    results.append(
+        measure("draw_start_screen", start_frame, 3000 * scale, "fps")
+    )
+    results.append(measure(
+        "draw_start_screen_compose", compose(start_frame), 300 * scale, "fps"
+    ))
+
+    def restart():
+        game.start_run()
+        game_frame()
+    results.append(
+        measure("restart_to_frame", restart, 300 * scale, "calls")
+    )
+    game.finish_replay()
+    return results
+
+
+def bench_render_scales(scale):
+    """update_game at native resolution and at half resolution scaled up
+    to the window, each in a new Game with the preset's other settings."""
+    current = settings.current
+    preset_scale = current.render_scale
+    results = []
+    try:
+        for render_scale in (1.0, 0.5):
+            current.render_scale = render_scale
+            game = make_game()
+            results.append(measure(
+                f"update_game_scale_{render_scale:g}",
+                lambda: play_frame(game), 3000 * scale, "fps"
+            ))
+    finally:
+        current.render_scale = preset_scale
+    return results
+
+
+def run_suite(scale=1):
+    """Run every benchmark and return the list of results."""
+    results = bench_simulation(scale) + bench_batch(scale)
+    game = make_game()
+    results += bench_pieces(game, scale)
+    results += bench_frames(game, scale)
+    results += bench_render_scales(scale)
+    pygame.quit()
+    return results
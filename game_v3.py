@@ -1,274 +1,579 @@
 """Module containing the Game class for running the llama game."""
 
+import io
 import random
+import time
 import pygame
+import settings
+from asset_manager import assets
 from llama_v3 import Llama
 from obstacle_v3 import Obstacle
+from hud import Counter
+from profiler import FrameProfiler, StartupTimer
+from replay import ReplayWriter
+from leaderboard import Leaderboard, default_player
+from settings import (
+    BACKGROUND_PATH, FONT_PATH, ICON_PATH, PACK_PATH, RED, YELLOW
+)
+from simulation import Simulation, TICKS_PER_SECOND
 
-white = (255, 255, 255)
+white = settings.WHITE
+STEP_SECONDS = 1 / TICKS_PER_SECOND
+MAX_FRAME_SECONDS = 0.25
+RESTART_BUDGET_SECONDS = 1 / 30
+IDLE_WAIT_MS = 250
+UNFOCUSED_WAIT_MS = 1000
+UNFOCUSED_FPS = 10
 
 class Game:
     """Main game class handling game state, rendering, input, and logic."""
-    def __init__(self):
-        """Initialize the game and set up the initial state."""
+    def __init__(self, fps=None, seed=None, player=None, startup=None):
+        """Open the window with just what the start screen needs; fps is
+        the render rate, which is independent of the simulation rate and
+        defaults to the current settings, seed makes the sequence of runs
+        reproducible, player is the name scores are recorded under, and
+        startup is a StartupTimer to record the stages in. The rest is
+        loaded by initialize_game()."""
+        self.startup = startup or StartupTimer()
         pygame.init()
+        self.startup.mark("pygame.init")
+        self.settings = settings.current
+        self.fps = self.settings.fps if fps is None else fps
+        self.antialias = self.settings.effects
+        self.scale = self.settings.render_scale
+        self.drawn = None
+        self.update_rects = None
+        self.overlay = None
+        self.overlay_key = None
+        self.overlay_shown = False
+        self.focused = True
+        self.runs_started = 0
+        self.hud_lines = []
+        self.hud_refresh = 0
+        self.player = player or default_player()
+        self.seed_source = random.Random(seed)
+        self.replay = None
+        self.scores = Leaderboard()
+        self.last_entry = None
+        self.profiler = FrameProfiler()
+        self.profiler_lines = []
+        self.profiler_refresh = 0
+        self.restart_started = None
+        self.restart_latency = None
+        pygame.display.set_caption("Llama Game - by Daniel Wu")
+        self.window = self.open_window()
+        self.screen = self.fit_window()
+        self.startup.mark("set_mode")
+        self.clock = pygame.time.Clock()
+        self.font = assets.font(FONT_PATH, self.px(50))
+        self.small_font = assets.font(FONT_PATH, self.px(28))
+        self.tiny_font = assets.font(FONT_PATH, self.px(20))
+        self.startup.mark("font loads")
+        assets.open_pack(PACK_PATH)
+        self.background = assets.scaled(
+            BACKGROUND_PATH, self.settings.render_size(), alpha=False
+        )
+        self.startup.mark("background load")
+        self.sim = None
         self.reset_game()
-        self.show_start = True
+
+    def open_window(self):
+        """Set the display mode: a resizable window or fullscreen, with
+        vsync if the settings ask for it and the driver supports it."""
+        if self.settings.fullscreen:
+            size, flags = (0, 0), pygame.FULLSCREEN
+        else:
+            size, flags = self.settings.window_size, pygame.RESIZABLE
+        if self.settings.vsync:
+            try:
+                return pygame.display.set_mode(
+                    size, flags | pygame.SCALED, vsync=1
+                )
+            except pygame.error as e:
+                print(f"Vsync unavailable: {e}")
+        return pygame.display.set_mode(size, flags)
+
+    def fit_window(self):
+        """Work out where frames go in the window and return the surface to
+        draw them on: the window itself when the render size matches it,
+        otherwise an off-screen surface that present() scales up."""
+        self.window = pygame.display.get_surface()
+        self.drawn = None
+        self.overlay_key = None
+        self.overlay_shown = False
+        render_size = self.settings.render_size()
+        window_size = self.window.get_size()
+        if render_size == window_size:
+            self.frame_area = None
+            self.frame_factor = 1
+            return self.window
+        factor = min(
+            window_size[0] / render_size[0], window_size[1] / render_size[1]
+        )
+        if self.settings.integer_scaling and factor >= 1:
+            factor = int(factor)
+        area = pygame.Rect(
+            0, 0, int(render_size[0] * factor), int(render_size[1] * factor)
+        )
+        area.center = self.window.get_rect().center
+        self.window.fill((0, 0, 0))
+        self.frame_area = self.window.subsurface(area)
+        self.frame_factor = factor
+        return pygame.Surface(render_size).convert()
+
+    def present(self):
+        """Scale the finished frame up into the window, if it was drawn off
+        screen. Nearest-neighbour scaling is used because smoothscale costs
+        more than drawing the frame at full size."""
+        if self.frame_area is not None:
+            pygame.transform.scale(
+                self.screen, self.frame_area.get_size(), self.frame_area
+            )
+
+    def present_rects(self, rects):
+        """Scale just rects of the off-screen frame up into the window and
+        return where they landed in window coordinates. Overlapping rects,
+        such as a sprite's old and new position, are merged first, since
+        each scale call costs more than the pixels it saves."""
+        merged = []
+        for rect in rects:
+            index = rect.collidelist(merged)
+            if index < 0:
+                merged.append(rect)
+            else:
+                merged[index] = merged[index].union(rect)
+        k = int(self.frame_factor)
+        left, top = self.frame_area.get_abs_offset()
+        placed = []
+        for rect in merged:
+            dest = pygame.Rect(rect.x * k, rect.y * k, rect.w * k, rect.h * k)
+            pygame.transform.scale(
+                self.screen.subsurface(rect), dest.size,
+                self.frame_area.subsurface(dest)
+            )
+            placed.append(dest.move(left, top))
+        return placed
+
+    def show_frame(self):
+        """Put the finished frame on the display: only the dirty rects if
+        the last draw recorded them, otherwise the whole frame."""
+        rects = self.update_rects
+        self.update_rects = None
+        if rects is None:
+            self.present()
+            pygame.display.flip()
+        elif self.frame_area is None:
+            pygame.display.update(rects)
+        else:
+            pygame.display.update(self.present_rects(rects))
+
+    def dirty_rects_enabled(self):
+        """Return True if this frame may be drawn with dirty rects: the
+        setting is on, the profiler overlay is off and the frame reaches
+        the window at a whole-number scale."""
+        return (self.settings.dirty_rects and not self.profiler.enabled
+                and float(self.frame_factor).is_integer())
+
+    def px(self, length):
+        """Return a length in screen coordinates at the render scale."""
+        return round(length * self.scale)
+
+    def point(self, x, y):
+        """Return a point in screen coordinates at the render scale."""
+        return round(x * self.scale), round(y * self.scale)
 
     def reset_game(self):
-        """Reset the game state to start a new game."""
-        self.screen = pygame.display.set_mode((1000, 720))
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font("assets/lemonmilk.ttf", 50)
-        self.small_font = pygame.font.Font("assets/lemonmilk.ttf", 28)
-        self.tiny_font = pygame.font.Font("assets/lemonmilk.ttf", 20)
-        self.llama = Llama(200, 500)
-        self.obstacles = [
-            Obstacle(
-                1000 + i * 300, 0, random.choice([1, 0.9, 0.8, 0.7, 0.6]), 5
-            ) for i in range(2)
-        ]
+        """Reset the run state to show the start screen, reusing the
+        window, clock, fonts and simulation."""
+        if self.sim is not None:
+            self.sim.reset()
+        self.accumulator = 0.0
         self.quit_game = False
         self.game_over = False
         self.paused = False
-        self.ticks_survived = 0
-        self.spawn_timer = 0
-        self.spawn_interval = 120
-        self.min_spawn_interval = 40
-        self.obstacle_speed = 5
-        self.max_obstacle_speed = 11
-        self.difficulty_timer = 0
-        self.highscore = self.load_high_score()
         self.show_start = True
 
     def initialize_game(self):
-        """Initialize display settings and load the high score."""
-        pygame.display.set_icon(
-            pygame.image.load("assets/llama_icon.png")
+        """Load what the start screen does not need: the window icon, the
+        game sprites and the simulation."""
+        pygame.display.set_icon(assets.image(ICON_PATH))
+        Obstacle.preload_sprites()
+        self.time_counter = Counter(
+            self.small_font, "Time: ", "s", white, self.antialias
         )
-        pygame.display.set_caption("Llama Game - by Daniel Wu")
-        self.highscore = self.load_high_score()
+        self.speed_counter = Counter(
+            self.tiny_font, "Speed: ", "", white, self.antialias
+        )
+        self.sim = Simulation(
+            llama_factory=Llama, obstacle_factory=Obstacle
+        )
+        self.sim.profiler = self.profiler
+        self.startup.mark("icon and sprites")
 
     def run_game(self):
         """Main game loop handling events, updates, and rendering."""
-        self.initialize_game()
-        bg = pygame.transform.scale(
-            pygame.image.load("assets/ground.png").convert(), (1000, 720)
-        )
+        bg = self.background
+        if self.sim is None:
+            self.draw_start_screen(bg)
+            self.show_frame()
+            self.startup.mark("first flip")
+            self.initialize_game()
+            self.startup.finish()
+        prof = self.profiler
+        last_frame = time.perf_counter()
         while not self.quit_game:
+            now = time.perf_counter()
+            frame_time = now - last_frame
+            last_frame = now
+            prof.start_frame()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.quit_game = True
+                if event.type == pygame.VIDEORESIZE:
+                    self.screen = self.fit_window()
+                if event.type in (pygame.WINDOWFOCUSLOST,
+                                  pygame.WINDOWMINIMIZED):
+                    self.focused = False
+                    if not self.show_start and not self.game_over:
+                        self.paused = True
+                if event.type in (pygame.WINDOWFOCUSGAINED,
+                                  pygame.WINDOWRESTORED):
+                    self.focused = True
+                if event.type == pygame.WINDOWEXPOSED:
+                    self.overlay_shown = False
+                    self.drawn = None
                 if event.type == pygame.KEYDOWN:
-                    if self.show_start and event.key == pygame.K_ESCAPE:
-                        self.show_start = False
-                        self.game_over = False
-                        self.paused = False
-                        self.ticks_survived = 0
-                        self.spawn_timer = 0
-                        self.difficulty_timer = 0
-                        self.obstacle_speed = 5
-                        self.spawn_interval = 120
-                        self.llama = Llama(200, 500)
-                        self.obstacles = [
-                            Obstacle(
-                                1000 + i * 300, 0,
-                                random.choice([1, 0.9, 0.8, 0.7, 0.6]), 5
-                            ) for i in range(2)
-                        ]
+                    if (event.key == pygame.K_ESCAPE
+                            and (self.show_start or self.game_over)):
+                        self.start_run()
                     elif event.key == pygame.K_ESCAPE:
-                        if self.game_over:
-                            self.reset_game()
-                            self.initialize_game()
-                            bg = pygame.transform.scale(
-                                pygame.image.load(
-                                    "assets/ground.png"
-                                ).convert(), (1000, 720)
-                            )
-                        elif self.paused:
+                        if self.paused:
                             self.paused = False
                         elif not self.game_over:
                             self.paused = True
+                    elif event.key == pygame.K_F3:
+                        prof.toggle()
+                    elif event.key == pygame.K_F4:
+                        self.write_trace()
+            prof.mark("events")
 
             if self.show_start:
                 self.draw_start_screen(bg)
             elif not self.game_over and not self.paused:
-                self.update_game(bg)
+                self.update_game(bg, frame_time)
             elif self.paused:
                 self.draw_pause_screen(bg)
+            if prof.enabled:
+                self.draw_profiler_overlay()
+                prof.mark("profiler overlay")
 
-            pygame.display.flip()
-            self.clock.tick(60)
+            self.show_frame()
+            prof.mark("display update")
+            if self.restart_started is not None:
+                self.restart_latency = (
+                    time.perf_counter() - self.restart_started
+                )
+                self.restart_started = None
+                if self.restart_latency > RESTART_BUDGET_SECONDS:
+                    print(
+                        "Restart took "
+                        f"{self.restart_latency * 1000:.1f} ms to first frame"
+                    )
+            if self.is_idle():
+                self.wait_for_event()
+                last_frame = time.perf_counter()
+                prof.mark("idle wait")
+            elif self.focused:
+                self.clock.tick(self.fps)
+                prof.mark("clock wait")
+            else:
+                self.clock.tick(min(self.fps or UNFOCUSED_FPS, UNFOCUSED_FPS))
+                prof.mark("clock wait")
+            prof.end_frame()
+        self.finish_replay()
+        self.scores.close()
+
+    def is_idle(self):
+        """Return True if nothing on screen moves until an event arrives:
+        the start, pause or game over screen is showing and the profiler
+        overlay is off."""
+        return ((self.show_start or self.paused)
+                and not self.profiler.enabled)
+
+    def wait_for_event(self):
+        """Sleep until an event arrives, waking after a timeout so that a
+        new leaderboard snapshot still shows up; the event is put back for
+        the next frame to handle."""
+        timeout = IDLE_WAIT_MS if self.focused else UNFOCUSED_WAIT_MS
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
+
+    @property
+    def highscore(self):
+        """Return the best verified score from the leaderboard snapshot."""
+        return self.scores.snapshot.best
+
+    def start_run(self):
+        """Start a new run with a fresh seed and begin recording its
+        replay in memory; only run state is reset, so this is also the
+        restart after a game over."""
+        self.restart_started = time.perf_counter()
+        self.runs_started += 1
+        self.show_start = False
+        self.game_over = False
+        self.paused = False
+        seed = self.seed_source.getrandbits(32)
+        self.sim.reset(seed)
+        self.accumulator = 0.0
+        self.hud_refresh = 0
+        self.finish_replay()
+        self.replay = ReplayWriter(io.BytesIO(), seed)
+
+    def finish_replay(self):
+        """Stop recording the current run and return its replay as bytes,
+        or None if no run is being recorded."""
+        if self.replay is None:
+            return None
+        self.replay.finish()
+        data = self.replay.stream.getvalue()
+        self.replay = None
+        return data
+
+    def write_trace(self):
+        """Write the profiler buffer to a Chrome trace file in the current
+        directory."""
+        path = time.strftime("trace_%Y%m%d_%H%M%S.json")
+        count = self.profiler.write_chrome_trace(path)
+        print(f"Wrote {count} trace events to {path}")
+
+    def draw_profiler_overlay(self):
+        """Draw rolling p50/p99 times per phase and the asset cache
+        statistics, refreshed twice a second."""
+        self.overlay_shown = False
+        now = time.perf_counter()
+        if now >= self.profiler_refresh:
+            self.profiler_refresh = now + 0.5
+            stats = self.profiler.percentiles()
+            self.profiler_lines = [
+                self.tiny_font.render(
+                    f"{name}: {p50:.2f} / {p99:.2f} ms", self.antialias, white
+                ) for name, (p50, p99) in sorted(stats.items())
+            ]
+            self.profiler_lines.append(
+                self.tiny_font.render(assets.report(), self.antialias, white)
+            )
+        right = self.screen.get_width() - self.px(20)
+        for i, line in enumerate(self.profiler_lines):
+            self.screen.blit(
+                line, (right - line.get_width(), self.px(10 + i * 24))
+            )
 
     def handle_input(self):
-        """Handle player input for jumping."""
+        """Return True if the player is holding a jump key."""
         keys = pygame.key.get_pressed()
-        if keys[pygame.K_SPACE] or keys[pygame.K_UP]:
-            self.llama.jump()
+        return keys[pygame.K_SPACE] or keys[pygame.K_UP]
+
+    def draw_cached_overlay(self, key):
+        """Show the cached screen and return True if it was composed for
+        key; otherwise return False so the caller composes it again. If
+        the screen still shows it, nothing is drawn or updated."""
+        self.drawn = None
+        self.update_rects = None
+        if key != self.overlay_key:
+            return False
+        if self.overlay_shown:
+            self.update_rects = []
+        else:
+            self.screen.blit(self.overlay, (0, 0))
+            self.overlay_shown = True
+        return True
+
+    def cache_overlay(self, key):
+        """Keep a copy of the screen just composed for key."""
+        self.overlay = self.screen.copy()
+        self.overlay_key = key
+        self.overlay_shown = True
 
     def draw_start_screen(self, bg):
-        """Draw the start screen with title and instructions."""
+        """Draw the start screen with title, instructions and top scores,
+        composing it again only when the leaderboard snapshot changes."""
+        key = ("start", self.scores.snapshot)
+        if self.draw_cached_overlay(key):
+            self.profiler.mark("start screen")
+            return
         self.screen.blit(bg, (0, 0))
         title = self.font.render(
-            "Llama Game - Daniel Wu", True, (255, 255, 0)
-        )
-        hs_text = self.small_font.render(
-            f"High Score: {self.highscore:.1f}s", True, white
+            "Llama Game - Daniel Wu", self.antialias, YELLOW
         )
+        if self.scores.snapshot.loaded:
+            high_score = f"High Score: {self.highscore:.1f}s"
+        else:
+            high_score = "High Score: --"
+        hs_text = self.small_font.render(high_score, self.antialias, white)
         jump_info = self.small_font.render(
-            "Press SPACE to Jump", True, white
+            "Press SPACE to Jump", self.antialias, white
         )
         esc_info = self.small_font.render(
-            "Press ESC to Start/Pause/Unpause", True, white
+            "Press ESC to Start/Pause/Unpause", self.antialias, white
         )
-        self.screen.blit(title, title.get_rect(center=(500, 250)))
-        self.screen.blit(hs_text, hs_text.get_rect(center=(500, 320)))
-        self.screen.blit(jump_info, jump_info.get_rect(center=(500, 380)))
-        self.screen.blit(esc_info, esc_info.get_rect(center=(500, 430)))
-
-    def update_game(self, bg):
-        """Update game state, handle collisions, and draw game elements."""
-        self.handle_input()
-        self.screen.blit(bg, (0, 0))
-        self.llama.update()
-        for o in self.obstacles:
-            o.update()
-            o.draw(self.screen)
-        self.obstacles = [o for o in self.obstacles if o.x > -o.size]
-
-        self.difficulty_timer += 1
-        if self.difficulty_timer % 90 == 0:
-            if self.spawn_interval > self.min_spawn_interval:
-                self.spawn_interval -= 2
-            if self.obstacle_speed < self.max_obstacle_speed:
-                self.obstacle_speed = min(
-                    self.obstacle_speed + 0.4, self.max_obstacle_speed
-                )
-            for o in self.obstacles:
-                o.speed = self.obstacle_speed
-
-        self.spawn_timer += 1
-        if self.spawn_timer >= self.spawn_interval:
-            self.spawn_timer = 0
-            min_jump_gap = 220
-            last_x = max([o.x for o in self.obstacles], default=0)
-            group_chance = random.random()
-            if group_chance < 0.25:
-                group_size = random.randint(2, 4)
-                base_x = max(1000, last_x + min_jump_gap)
-                scale = random.choice([1, 0.9, 0.8, 0.7, 0.6])
-                jump_distance = 180
-                min_gap = int(jump_distance + 30 * scale)
-                max_gap = min_gap + 60
-                group_y = random.choice([0, 20, 40, 60])
-                for i in range(group_size):
-                    gap = random.randint(min_gap, max_gap)
-                    x = base_x + i * gap
-                    y = group_y + random.choice([0, 10, 20])
-                    self.obstacles.append(
-                        Obstacle(x, y, scale, self.obstacle_speed)
-                    )
-            else:
-                scale = random.choice([1, 0.9, 0.8, 0.7, 0.6])
-                y = random.choice([0, 10, 20, 30, 40, 50, 60])
-                spawn_x = max(1000, last_x + min_jump_gap)
-                self.obstacles.append(
-                    Obstacle(spawn_x, y, scale, self.obstacle_speed)
-                )
-            variation = random.randint(-20, 20)
-            self.spawn_interval = max(
-                self.min_spawn_interval, self.spawn_interval + variation
+        for text, y in ((title, 250), (hs_text, 320), (jump_info, 380),
+                        (esc_info, 430)):
+            self.screen.blit(text, text.get_rect(center=self.point(500, y)))
+        for i, (player, seconds) in enumerate(self.scores.snapshot.top[:5]):
+            entry = self.tiny_font.render(
+                f"{i + 1}. {player}  {seconds:.1f}s", self.antialias, white
+            )
+            self.screen.blit(
+                entry, entry.get_rect(center=self.point(500, 490 + i * 28))
             )
+        self.cache_overlay(key)
+        self.profiler.mark("start screen")
 
-        self.llama.draw(self.screen)
-        llama_rect = self.llama.get_rect()
-        for o in self.obstacles:
-            if llama_rect.colliderect(o.get_rect()):
+    def update_game(self, bg, frame_time=STEP_SECONDS):
+        """Advance the simulation in fixed steps covering frame_time seconds,
+        handle collisions, and draw game elements interpolated between the
+        last two steps."""
+        sim = self.sim
+        prof = self.profiler
+        self.accumulator = min(
+            self.accumulator + frame_time, MAX_FRAME_SECONDS
+        )
+        jump = self.handle_input()
+        prof.mark("handle_input")
+        while self.accumulator >= STEP_SECONDS:
+            self.accumulator -= STEP_SECONDS
+            if self.replay is not None:
+                self.replay.record(jump)
+            if sim.step(jump):
                 self.game_over = True
                 self.paused = True
-                seconds = round(self.ticks_survived / 60, 1)
-                if seconds > self.highscore:
-                    self.update_high_score(seconds)
-                    self.highscore = seconds
+                self.accumulator = 0.0
+                replay = self.finish_replay()
+                if replay is not None:
+                    self.last_entry = self.scores.submit(
+                        self.player, sim.final_seconds, replay
+                    )
+                    prof.mark("score submit")
                 break
 
-        self.ticks_survived += 1
-        seconds = self.ticks_survived / 60
-        self.screen.blit(
-            self.small_font.render(f"Time: {seconds:.1f}s", True, white),
-            (20, 10)
-        )
-        self.screen.blit(
-            self.tiny_font.render(
-                f"Speed: {self.obstacle_speed:.1f}", True, white
-            ),
-            (20, 40)
-        )
+        alpha = 1.0 if self.game_over else self.accumulator / STEP_SECONDS
+        self.draw_scene(bg, alpha, self.dirty_rects_enabled())
+        self.draw_hud()
+        prof.mark("hud text")
+
+    def draw_hud(self):
+        """Draw the Time and Speed text, reading the values at most hud_hz
+        times a second of game time, or every frame if hud_hz is 0. The
+        text is composed from pre-rendered glyphs, and only when the
+        number shown changes."""
+        sim = self.sim
+        if self.game_over or sim.ticks_survived >= self.hud_refresh:
+            if self.settings.hud_hz:
+                self.hud_refresh = (
+                    sim.ticks_survived
+                    + TICKS_PER_SECOND // self.settings.hud_hz
+                )
+            self.hud_lines = [
+                self.time_counter.render(f"{sim.seconds_survived():.1f}"),
+                self.speed_counter.render(f"{sim.obstacle_speed:.1f}"),
+            ]
+        rects = [
+            self.screen.blit(self.hud_lines[0], self.point(20, 10)),
+            self.screen.blit(self.hud_lines[1], self.point(20, 40)),
+        ]
+        if self.drawn is not None:
+            self.drawn += rects
+        if self.update_rects is not None:
+            self.update_rects += rects
+
+    def visible_sprites(self, alpha=1.0):
+        """Return (image, position) pairs for the obstacles and llama,
+        leaving out obstacles wholly outside the screen."""
+        scale = self.scale
+        width = self.screen.get_width()
+        sprites = [o.sprite(alpha, scale) for o in self.sim.obstacles]
+        sprites = [
+            (image, pos) for image, pos in sprites
+            if -image.get_width() < pos[0] < width
+        ]
+        sprites.append(self.sim.llama.sprite(alpha, scale))
+        return sprites
+
+    def draw_scene(self, bg, alpha=1.0, dirty=False):
+        """Draw the background, then the visible obstacles and the llama in
+        one blits() batch, interpolated by alpha between the previous and
+        current step. The running, paused and game over screens all draw
+        the scene through here.
+
+        With dirty set, only the background under what was drawn last
+        frame is restored, and those areas plus the new sprites are left in
+        update_rects for show_frame(); otherwise the whole background is
+        redrawn and the whole frame shown.
+        """
+        screen = self.screen
+        self.overlay_shown = False
+        restore = self.drawn if dirty else None
+        if restore is None:
+            screen.blit(bg, (0, 0))
+        else:
+            screen.blits([(bg, rect, rect) for rect in restore], False)
+        self.profiler.mark("background blit")
+        drawn = screen.blits(self.visible_sprites(alpha), dirty)
+        self.profiler.mark("sprite draws")
+        self.drawn = drawn if dirty else None
+        self.update_rects = restore + drawn if restore is not None else None
 
     def draw_pause_screen(self, bg):
-        """Draw the pause or game over screen."""
-        self.screen.blit(bg, (0, 0))
-        for o in self.obstacles:
-            o.draw(self.screen)
-        self.llama.draw(self.screen)
+        """Draw the pause or game over screen. The scene is frozen while it
+        shows, so it is composed again only for a new pause or when the
+        leaderboard snapshot changes."""
+        key = ("pause", self.game_over, self.runs_started,
+               self.sim.ticks_survived, self.scores.snapshot)
+        if self.draw_cached_overlay(key):
+            self.profiler.mark("pause screen text")
+            return
+        self.draw_scene(bg)
         if self.game_over:
             pause_text = self.font.render(
-                "Game Over", True, (255, 0, 0)
+                "Game Over", self.antialias, RED
             )
             info_text = self.small_font.render(
-                "Press ESC to Restart", True, white
-            )
-            score_text = self.small_font.render(
-                f"Score: {self.ticks_survived / 60:.1f}s", True, white
+                "Press ESC to Restart", self.antialias, white
             )
+            snapshot = self.scores.snapshot
+            rank = snapshot.ranks.get(self.last_entry)
+            score = f"Score: {self.sim.seconds_survived():.1f}s"
+            if rank is not None:
+                score += f"  (Rank {rank} of {snapshot.total})"
+            score_text = self.small_font.render(score, self.antialias, white)
         else:
             pause_text = self.font.render(
-                "Paused", True, (255, 255, 0)
+                "Paused", self.antialias, YELLOW
             )
             info_text = self.small_font.render(
-                "Press ESC to Resume", True, white
+                "Press ESC to Resume", self.antialias, white
             )
             score_text = None
         hs_text = self.small_font.render(
-            f"High Score: {self.highscore:.1f}s", True, white
+            f"High Score: {self.highscore:.1f}s", self.antialias, white
         )
         self.screen.blit(
-            pause_text, pause_text.get_rect(center=(500, 300))
+            pause_text, pause_text.get_rect(center=self.point(500, 300))
         )
         self.screen.blit(
-            hs_text, hs_text.get_rect(center=(500, 370))
+            hs_text, hs_text.get_rect(center=self.point(500, 370))
         )
         if score_text:
             self.screen.blit(
-                score_text, score_text.get_rect(center=(500, 400))
+                score_text, score_text.get_rect(center=self.point(500, 400))
             )
             self.screen.blit(
-                info_text, info_text.get_rect(center=(500, 440))
+                info_text, info_text.get_rect(center=self.point(500, 440))
             )
         else:
             self.screen.blit(
-                info_text, info_text.get_rect(center=(500, 420))
+                info_text, info_text.get_rect(center=self.point(500, 420))
             )
-
-    def load_high_score(self):
-        """Load the high score from a file, creating it if necessary."""
-        try:
-            with open(
-                "highscore.txt", "r", encoding="utf-8"
-            ) as f:
-                value = f.read().strip()
-                return float(value) if value else 0.0
-        except IOError:
-            with open(
-                "highscore.txt", "w", encoding="utf-8"
-            ) as f:
-                f.write("0.0")
-            return 0.0
-
-    def update_high_score(self, score):
-        """Update the high score file if the current score is higher."""
-        if score > self.load_high_score():
-            with open(
-                "highscore.txt", "w", encoding="utf-8"
-            ) as f:
-                f.write(f"{score:.1f}")
+        self.cache_overlay(key)
+        self.profiler.mark("pause screen text")
@@ -0,0 +1,115 @@
+"""Module containing the glyph-atlas text used for the in-game HUD, which
+draws changing numbers without rasterizing TTF text every frame."""
+
+import pygame
+
+DIGITS = "0123456789."
+
+
+def kerning_between(font, first, second):
+    """Return the kerning between two characters, rounded to whole
+    pixels."""
+    a, b = font.metrics(first + second)
+    left = min(0, a[0], a[4] + b[0])
+    right = max(a[1], a[4], a[4] + b[1], a[4] + b[4])
+    return font.size(first + second)[0] - (right - left)
+
+
+class GlyphAtlas:
+    """Pre-rendered pieces of text packed side by side on one surface and
+    laid out with the font's advances and whole-pixel kerning."""
+    def __init__(self, font, pieces, color, antialias=True):
+        """Render every piece once with font, pack them into the atlas and
+        measure how far the pen moves from each piece to the next."""
+        glyphs = [
+            (piece, font.render(piece, antialias, color).convert_alpha())
+            for piece in pieces
+        ]
+        self.height = max(glyph.get_height() for _, glyph in glyphs)
+        self.surface = pygame.Surface(
+            (sum(glyph.get_width() for _, glyph in glyphs), self.height),
+            pygame.SRCALPHA
+        )
+        self.areas = {}
+        x = 0
+        for piece, glyph in glyphs:
+            self.surface.blit(
+                glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX
+            )
+            self.areas[piece] = pygame.Rect(x, 0, *glyph.get_size())
+            x += glyph.get_width()
+
+        kerning = {}
+
+        def kern(first, second):
+            if (first, second) not in kerning:
+                kerning[first, second] = kerning_between(font, first, second)
+            return kerning[first, second]
+
+        # A piece's offset is where its surface starts relative to the pen,
+        # which is left of it when the first glyph overhangs its origin.
+        self.offsets = {}
+        advances = {}
+        for piece in pieces:
+            pen = 0
+            left = 0
+            for index, metrics in enumerate(font.metrics(piece)):
+                left = min(left, pen + metrics[0])
+                pen += metrics[4]
+                if index + 1 < len(piece):
+                    pen += kern(piece[index], piece[index + 1])
+            self.offsets[piece] = left
+            advances[piece] = pen
+        self.steps = {
+            (first, second): advances[first] + kern(first[-1], second[0])
+            for first in pieces for second in pieces
+        }
+
+    def compose(self, pieces):
+        """Return a new surface showing the given pieces in order."""
+        steps = self.steps
+        placed = []
+        pen = 0
+        left = right = 0
+        previous = None
+        for piece in pieces:
+            if previous is not None:
+                pen += steps[previous, piece]
+            x = pen + self.offsets[piece]
+            area = self.areas[piece]
+            placed.append((x, area))
+            if x < left:
+                left = x
+            if x + area.w > right:
+                right = x + area.w
+            previous = piece
+        surface = pygame.Surface((right - left, self.height), pygame.SRCALPHA)
+        surface.blits([
+            (self.surface, (x - left, 0), area, pygame.BLEND_RGBA_MAX)
+            for x, area in placed
+        ], False)
+        return surface
+
+
+class Counter:
+    """A label followed by a number and an optional unit, composed from a
+    GlyphAtlas again only when the text it shows changes."""
+    def __init__(self, font, label, unit="", color=(255, 255, 255),
+                 antialias=True):
+        """Build the atlas of the label, digits and unit."""
+        pieces = [label] + list(DIGITS) + ([unit] if unit else [])
+        self.atlas = GlyphAtlas(font, pieces, color, antialias)
+        self.label = label
+        self.unit = unit
+        self.text = None
+        self.surface = None
+
+    def render(self, text):
+        """Return the surface for a number already formatted as text."""
+        if text != self.text:
+            pieces = [self.label, *text]
+            if self.unit:
+                pieces.append(self.unit)
+            self.surface = self.atlas.compose(pieces)
+            self.text = text
+        return self.surface
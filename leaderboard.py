@@ -0,0 +1,268 @@
+"""Module containing the SQLite-backed local leaderboard for the llama
+game."""
+
+import getpass
+import os
+import queue
+import sqlite3
+import threading
+import time
+from replay import Replay
+from settings import LEADERBOARD_PATH, REPLAY_DIR, REPLAY_KEEP
+from verify_replays import verify_replay
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    seed INTEGER NOT NULL,
+    replay BLOB NOT NULL,
+    created REAL NOT NULL,
+    verified INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS scores_by_seconds ON scores (seconds DESC, id);
+CREATE TABLE IF NOT EXISTS score_counts (
+    tenths INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+"""
+
+
+def default_player():
+    """Return the name to record scores under when none is given."""
+    try:
+        return getpass.getuser()
+    except (KeyError, OSError):
+        return "player"
+
+
+class Snapshot:
+    """An immutable view of the leaderboard for drawing screens: the top
+    entries as (player, seconds), the best score, the number of entries,
+    and the rank of each submission made this session."""
+    def __init__(self, top, total, ranks, loaded=True):
+        """Store the top entries, entry count and submission ranks;
+        loaded is False for the placeholder shown before the database
+        has been read."""
+        self.top = top
+        self.best = top[0][1] if top else 0.0
+        self.total = total
+        self.ranks = ranks
+        self.loaded = loaded
+
+
+class Leaderboard:
+    """Records every finished run in a SQLite database in WAL mode.
+
+    Submissions are verified against their replays and inserted in
+    batches by a background thread, which then publishes a fresh Snapshot.
+    Screens read the snapshot, so drawing never touches the database.
+    Scores are kept to a tenth of a second, so ranks come from a small
+    per-tenth histogram rather than counting rows. The database is opened
+    on the writer thread too, so constructing a Leaderboard never waits on
+    the disk, and it also copies each submitted replay to replay_dir,
+    keeping the newest replay_keep of them.
+    """
+    def __init__(self, path=LEADERBOARD_PATH, top_size=10,
+                 legacy_highscore="highscore.txt", replay_dir=REPLAY_DIR,
+                 replay_keep=REPLAY_KEEP):
+        """Start the writer thread, which opens the database and publishes
+        the first snapshot."""
+        self.path = path
+        self.replay_dir = replay_dir
+        self.replay_keep = replay_keep
+        self.top_size = top_size
+        self.legacy_highscore = legacy_highscore
+        self.ranks = {}
+        self.next_token = 0
+        self.snapshot = Snapshot([], 0, {}, loaded=False)
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(
+            target=self.run, name="leaderboard-writer", daemon=True
+        )
+        self.thread.start()
+
+    def connect(self):
+        """Open a connection with WAL journaling."""
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def load(self, connection):
+        """Create the schema, import the old single high score if the table
+        is empty, and publish the first snapshot."""
+        with connection:
+            connection.executescript(SCHEMA)
+            columns = [
+                row[1] for row in
+                connection.execute("PRAGMA table_info(scores)")
+            ]
+            if "verified" not in columns:
+                connection.execute(
+                    "ALTER TABLE scores ADD COLUMN"
+                    " verified INTEGER NOT NULL DEFAULT 1"
+                )
+        if self.count(connection) == 0:
+            self.import_legacy(connection, self.legacy_highscore)
+        self.snapshot = self.read_snapshot(connection)
+
+    def import_legacy(self, connection, highscore_path):
+        """Insert the score from the old highscore.txt file as an
+        unverified entry with no replay, since it was never recorded with
+        one."""
+        try:
+            with open(highscore_path, "r", encoding="utf-8") as f:
+                seconds = round(float(f.read().strip()), 1)
+            created = os.path.getmtime(highscore_path)
+        except (OSError, ValueError):
+            return
+        if not 0 < seconds < float("inf"):
+            return
+        with connection:
+            connection.execute(
+                "INSERT INTO scores"
+                " (player, seconds, seed, replay, created, verified)"
+                " VALUES (?, ?, 0, ?, ?, 0)",
+                (default_player(), seconds, b"", created)
+            )
+            connection.execute(
+                "INSERT INTO score_counts (tenths, count) VALUES (?, 1)"
+                " ON CONFLICT (tenths) DO UPDATE SET count = count + 1",
+                (round(seconds * 10),)
+            )
+        print(f"Imported unverified high score {seconds:.1f}s from "
+              f"{highscore_path}")
+
+    def insert(self, connection, entries):
+        """Insert (player, seconds, replay, created) entries in one
+        transaction."""
+        rows = [
+            (player, seconds, Replay.from_bytes(data).seed, data, created)
+            for player, seconds, data, created in entries
+        ]
+        with connection:
+            connection.executemany(
+                "INSERT INTO scores (player, seconds, seed, replay, created)"
+                " VALUES (?, ?, ?, ?, ?)", rows
+            )
+            connection.executemany(
+                "INSERT INTO score_counts (tenths, count) VALUES (?, 1)"
+                " ON CONFLICT (tenths) DO UPDATE SET count = count + 1",
+                [(round(row[1] * 10),) for row in rows]
+            )
+
+    def count(self, connection):
+        """Return the number of recorded runs."""
+        return connection.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM score_counts"
+        ).fetchone()[0]
+
+    def top(self, connection, limit):
+        """Return the best limit entries as (player, seconds)."""
+        return connection.execute(
+            "SELECT player, seconds FROM scores"
+            " ORDER BY seconds DESC, id LIMIT ?", (limit,)
+        ).fetchall()
+
+    def rank(self, connection, seconds):
+        """Return the rank a score holds: one more than the number of
+        strictly better scores."""
+        return connection.execute(
+            "SELECT COALESCE(SUM(count), 0) + 1 FROM score_counts"
+            " WHERE tenths > ?", (round(seconds * 10),)
+        ).fetchone()[0]
+
+    def read_snapshot(self, connection):
+        """Build a Snapshot from the database."""
+        return Snapshot(
+            self.top(connection, self.top_size), self.count(connection),
+            dict(self.ranks)
+        )
+
+    def submit(self, player, seconds, replay):
+        """Queue a finished run and its replay bytes for verification and
+        storage and return a token for looking up its rank in later
+        snapshots."""
+        self.next_token += 1
+        self.queue.put((self.next_token, player, seconds, replay))
+        return self.next_token
+
+    def run(self):
+        """Load the database, then insert queued submissions in batches
+        until close() is called."""
+        connection = self.connect()
+        try:
+            self.load(connection)
+        except sqlite3.Error as e:
+            print(f"Could not load scores: {e}")
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while len(batch) < 500:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [item for item in batch if item is not None]
+            try:
+                self.store(connection, batch)
+            except sqlite3.Error as e:
+                print(f"Could not save scores: {e}")
+        connection.close()
+
+    def store(self, connection, batch):
+        """Verify and insert a batch, then publish a new snapshot."""
+        entries = []
+        tokens = []
+        for token, player, seconds, data in batch:
+            created = time.time()
+            self.save_replay(data, created)
+            if verify_replay(data, seconds) is not None:
+                entries.append((player, seconds, data, created))
+                tokens.append((token, seconds))
+        if batch:
+            self.prune_replays()
+        if not entries:
+            return
+        self.insert(connection, entries)
+        for token, seconds in tokens:
+            self.ranks[token] = self.rank(connection, seconds)
+        self.snapshot = self.read_snapshot(connection)
+
+    def save_replay(self, data, created):
+        """Write a submitted replay to a file in replay_dir named after
+        when it was stored and its seed."""
+        try:
+            seed = Replay.from_bytes(data).seed
+        except ValueError:
+            seed = "invalid"
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(created))
+        try:
+            os.makedirs(self.replay_dir, exist_ok=True)
+            with open(os.path.join(self.replay_dir,
+                                   f"{stamp}_{seed}.llr"), "wb") as f:
+                f.write(data)
+        except OSError as e:
+            print(f"Could not save replay: {e}")
+
+    def prune_replays(self):
+        """Delete the oldest replay files beyond the newest replay_keep;
+        the names start with when they were stored, so they sort by age."""
+        try:
+            names = sorted(
+                name for name in os.listdir(self.replay_dir)
+                if name.endswith(".llr")
+            )
+            for name in names[:max(0, len(names) - self.replay_keep)]:
+                os.remove(os.path.join(self.replay_dir, name))
+        except OSError as e:
+            print(f"Could not prune replays: {e}")
+
+    def close(self):
+        """Finish pending writes and stop the writer thread."""
+        self.queue.put(None)
+        self.thread.join()
@@ -1,67 +1,48 @@
 """Module containing the Llama class for the llama game."""
 
 import pygame
+import settings
+from asset_manager import assets
+from settings import LLAMA_FRAME_PATHS as FRAME_PATHS
+from simulation import LlamaBody, LLAMA_SIZE
 
-class Llama:
+class Llama(LlamaBody):
     """Represents the player-controlled llama character with jumping and
     animation logic."""
+
     def __init__(self, x, y):
         """Initialize the llama with position, physics, and animation frames."""
-        self.x = x
-        self.y = 345
-        self.velocity = 0
-        self.is_jumping = False
-        self.gravity = 1
-        self.jump_strength = -15
-        self.animation_frames = [
-            pygame.image.load("assets/llama.png").convert_alpha(),
-            pygame.image.load("assets/llama2.png").convert_alpha(),
-            pygame.image.load("assets/llama3.png").convert_alpha(),
-        ]
-        self.current_frame = 0
-        self.frame_counter = 0
-        self.frame_delay = 5
-
-    def jump(self):
-        """Make the llama jump if it is not already jumping."""
-        if not self.is_jumping:
-            self.is_jumping = True
-            self.velocity = self.jump_strength
+        super().__init__(x, y)
+        self.animation_frames = self.load_frames()
+        self.frame_count = len(self.animation_frames)
 
-    def update(self):
-        """Update the llama's position, velocity, and animation frame."""
-        if self.is_jumping:
-            self.velocity += self.gravity
-            self.y += self.velocity
-            if self.y >= 345:
-                self.y = 345
-                self.is_jumping = False
-        self.frame_counter += 1
-        if self.frame_counter >= self.frame_delay:
-            self.frame_counter = 0
-            self.current_frame = (
-                (self.current_frame + 1) % len(self.animation_frames)
-            )
+    @staticmethod
+    def load_frames():
+        """Return the scaled animation frames from the asset manager, which
+        shares them between every Llama so restarts do not repeat the
+        work."""
+        size = round(LLAMA_SIZE * settings.current.render_scale)
+        return [
+            assets.scaled(
+                path, (size, size), smooth=settings.current.smooth_scaling
+            ) for path in FRAME_PATHS
+        ]
 
-    def draw(self, screen):
-        """Draw the current llama animation frame on the screen."""
-        screen.blit(
-            pygame.transform.smoothscale(
-                self.animation_frames[self.current_frame], (80, 80)
-            ),
-            (self.x, self.y)
+    def sprite(self, alpha=1.0, scale=1.0):
+        """Return the current animation frame and where to blit it, alpha
+        of the way from the previous position to the current one, with
+        positions multiplied by the render scale."""
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return (
+            self.animation_frames[self.current_frame],
+            (self.x * scale, y * scale)
         )
 
+    def draw(self, screen, alpha=1.0, scale=1.0):
+        """Draw the current llama animation frame on the screen and return
+        the area drawn."""
+        return screen.blit(*self.sprite(alpha, scale))
+
     def get_rect(self):
         """Return a pygame Rect representing the llama's collision hitbox."""
-        margin = 0.3
-        width = 80
-        height = 80
-        shrink_w = int(width * margin)
-        shrink_h = int(height * margin)
-        return pygame.Rect(
-            self.x + shrink_w // 2,
-            self.y + shrink_h // 2,
-            width - shrink_w,
-            height - shrink_h
-        )
+        return pygame.Rect(self.hitbox())
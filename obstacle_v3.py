@@ -1,37 +1,47 @@
 """Module for the Obstacle class used in the llama game."""
 
 import pygame
+import settings
+from asset_manager import assets
+from settings import CACTUS_PATH
+from simulation import ObstacleBody, OBSTACLE_BASE_SIZE, OBSTACLE_SCALES
 
-class Obstacle:
+class Obstacle(ObstacleBody):
     """Represents an obstacle in the llama game, handling its position, image,
     movement, and collision detection."""
-    def __init__(self, x, y, scale=0.8, speed=5):
-        """Initialize an obstacle with position, size, and movement speed."""
-        size = int(50 * scale)
-        self.size = size
-        self.x = x
-        self.y = 425 - size
-        self.image = pygame.transform.scale(
-            pygame.image.load("assets/cactus.png"),
-            (size, size)
-        )
-        self.speed = speed
-
-    def update(self):
-        """Update the obstacle position by moving it to the left."""
-        self.x -= self.speed
-
-    def draw(self, screen):
-        """Draw the obstacle on the specified screen."""
-        screen.blit(self.image, (self.x, self.y))
+    __slots__ = ("image",)
+
+    def reset(self, x, y, scale=0.8, speed=5):
+        """Reinitialize the obstacle and pick up the sprite for its size."""
+        super().reset(x, y, scale, speed)
+        self.image = self.get_sprite(self.size)
+
+    @staticmethod
+    def get_sprite(size):
+        """Return the shared cactus sprite for a size, at the render scale,
+        from the asset manager, which scales it only the first time each
+        size is needed."""
+        size = round(size * settings.current.render_scale)
+        return assets.scaled(CACTUS_PATH, (size, size))
+
+    @classmethod
+    def preload_sprites(cls):
+        """Build the sprite for every spawnable scale ahead of play."""
+        for scale in OBSTACLE_SCALES:
+            cls.get_sprite(int(OBSTACLE_BASE_SIZE * scale))
+
+    def sprite(self, alpha=1.0, scale=1.0):
+        """Return the obstacle's image and where to blit it, alpha of the
+        way from its previous position to its current one, with positions
+        multiplied by the render scale."""
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        return self.image, (x * scale, self.y * scale)
+
+    def draw(self, screen, alpha=1.0, scale=1.0):
+        """Draw the obstacle on the specified screen and return the area
+        drawn."""
+        return screen.blit(*self.sprite(alpha, scale))
 
     def get_rect(self):
         """Return a Rect representing the obstacle's collision hitbox."""
-        margin = 0.5
-        shrink = int(self.size * margin)
-        return pygame.Rect(
-            self.x + shrink // 2,
-            self.y + shrink // 2,
-            self.size - shrink,
-            self.size - shrink
-        )
+        return pygame.Rect(self.hitbox())
@@ -0,0 +1,155 @@
+"""Module containing the FrameProfiler used to time each phase of a frame."""
+
+import json
+import os
+import time
+
+
+class FrameProfiler:
+    """Times the phases of each frame into a bounded ring buffer.
+
+    A phase is closed by mark(name), which records the time since the
+    previous mark, so a frame is a run of back-to-back phases between
+    start_frame() and end_frame(). Every call returns straight away while
+    the profiler is disabled.
+    """
+    def __init__(self, capacity=8192):
+        """Preallocate room for capacity phase records."""
+        self.enabled = False
+        self.capacity = capacity
+        self.names = [None] * capacity
+        self.starts = [0.0] * capacity
+        self.durations = [0.0] * capacity
+        self.index = 0
+        self.size = 0
+        self.origin = time.perf_counter()
+        self.last = self.origin
+        self.frame_begin = self.origin
+
+    def toggle(self):
+        """Switch recording on or off and return the new state."""
+        self.enabled = not self.enabled
+        self.last = time.perf_counter()
+        return self.enabled
+
+    def start_frame(self):
+        """Begin timing a new frame."""
+        if self.enabled:
+            self.frame_begin = self.last = time.perf_counter()
+
+    def mark(self, name):
+        """Record the phase that ran since the previous mark as name."""
+        if self.enabled:
+            now = time.perf_counter()
+            self.record(name, self.last, now)
+            self.last = now
+
+    def end_frame(self):
+        """Record the whole frame as a single "frame" event."""
+        if self.enabled:
+            self.record("frame", self.frame_begin, time.perf_counter())
+
+    def record(self, name, start, end):
+        """Store one event, overwriting the oldest once the buffer is full."""
+        i = self.index
+        self.names[i] = name
+        self.starts[i] = start
+        self.durations[i] = end - start
+        self.index = (i + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def events(self):
+        """Yield the buffered (name, start, duration) events, oldest first."""
+        begin = (self.index - self.size) % self.capacity
+        for k in range(self.size):
+            i = (begin + k) % self.capacity
+            yield self.names[i], self.starts[i], self.durations[i]
+
+    def percentiles(self):
+        """Return {phase: (p50_ms, p99_ms)} over the buffered events."""
+        samples = {}
+        for name, _, duration in self.events():
+            samples.setdefault(name, []).append(duration)
+        stats = {}
+        for name, values in samples.items():
+            values.sort()
+            count = len(values)
+            stats[name] = (
+                values[count // 2] * 1000,
+                values[min(count - 1, int(count * 0.99))] * 1000
+            )
+        return stats
+
+    def write_chrome_trace(self, path):
+        """Write the buffer as Chrome trace-event JSON (chrome://tracing or
+        ui.perfetto.dev) and return the number of events written."""
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": 1,
+                "tid": 1,
+            } for name, start, duration in self.events()
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+def process_age():
+    """Return the wall-clock seconds since this process started, read from
+    /proc, or None where that is not available."""
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+    return max(uptime - started, 0.0)
+
+
+class StartupTimer:
+    """Times the stages of starting the game, from process start to the
+    first frame and the deferred loading that follows it."""
+    def __init__(self, verbose=False):
+        """Start timing now; verbose prints the report from finish()."""
+        self.verbose = verbose
+        self.stages = []
+        self.origin = self.last = time.perf_counter()
+
+    def add(self, name, seconds, counted=True):
+        """Record a stage that was timed elsewhere; one that is not
+        counted is reported after the total instead of in it."""
+        self.stages.append((name, seconds, counted))
+
+    def mark(self, name):
+        """Record the stage that ran since the previous mark as name."""
+        now = time.perf_counter()
+        self.stages.append((name, now - self.last, True))
+        self.last = now
+
+    def report(self):
+        """Return the stages and their total as printable lines."""
+        lines = [
+            f"{name:<24}{seconds * 1000:9.1f} ms"
+            for name, seconds, counted in self.stages if counted
+        ]
+        total = sum(
+            seconds for _, seconds, counted in self.stages if counted
+        )
+        lines.append(f"{'total':<24}{total * 1000:9.1f} ms")
+        lines.extend(
+            f"{name:<24}{seconds * 1000:9.1f} ms (not in total)"
+            for name, seconds, counted in self.stages if not counted
+        )
+        return "\n".join(lines)
+
+    def finish(self):
+        """Print the report if verbose."""
+        if self.verbose:
+            print("Startup:\n" + self.report())
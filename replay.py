@@ -0,0 +1,153 @@
+"""Module for recording and reading compact llama game replays.
+
+A replay is the run's seed plus the ticks on which jump was held. Held
+ticks are stored as runs, each a (gap since the previous run, length)
+pair of unsigned varints, so holding jump for a whole arc costs two
+bytes. A final pair with length 0 marks how many ticks the run lasted.
+
+    b"LLRP" | version | seed | (gap, length)* | (gap, 0)
+"""
+
+import sys
+from simulation import Simulation
+
+MAGIC = b"LLRP"
+VERSION = 1
+
+
+def encode_varint(value):
+    """Return value as an unsigned LEB128 varint."""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def decode_varint(data, pos):
+    """Read an unsigned varint from data at pos and return (value, pos)."""
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated replay")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+class ReplayWriter:
+    """Streams a replay to a binary stream one tick at a time."""
+    def __init__(self, stream, seed):
+        """Write the header for a run with the given seed to stream."""
+        self.stream = stream
+        self.tick = 0
+        self.last_end = 0
+        self.run_start = 0
+        self.run_length = 0
+        stream.write(MAGIC + bytes([VERSION]) + encode_varint(seed))
+
+    def record(self, jump):
+        """Record whether jump was held on the next tick."""
+        if jump:
+            if not self.run_length:
+                self.run_start = self.tick
+            self.run_length += 1
+        elif self.run_length:
+            self.flush_run()
+        self.tick += 1
+
+    def flush_run(self):
+        """Write the current run of held ticks."""
+        self.stream.write(
+            encode_varint(self.run_start - self.last_end)
+            + encode_varint(self.run_length)
+        )
+        self.last_end = self.run_start + self.run_length
+        self.run_length = 0
+
+    def finish(self):
+        """Write the end marker, leaving the stream open."""
+        if self.run_length:
+            self.flush_run()
+        self.stream.write(
+            encode_varint(self.tick - self.last_end) + encode_varint(0)
+        )
+
+    def close(self):
+        """Write the end marker and close the stream."""
+        self.finish()
+        self.stream.close()
+
+
+class Replay:
+    """A decoded replay: the seed, the runs of held jump input and the
+    number of ticks the run lasted."""
+    def __init__(self, seed, runs, ticks):
+        """Store the seed, (start, length) runs and tick count."""
+        self.seed = seed
+        self.runs = runs
+        self.ticks = ticks
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decode a replay, raising ValueError if it is malformed."""
+        if data[:4] != MAGIC or len(data) < 5 or data[4] != VERSION:
+            raise ValueError("Not a version 1 llama replay")
+        seed, pos = decode_varint(data, 5)
+        runs = []
+        end = 0
+        while True:
+            gap, pos = decode_varint(data, pos)
+            length, pos = decode_varint(data, pos)
+            if not length:
+                break
+            runs.append((end + gap, length))
+            end += gap + length
+        if pos != len(data):
+            raise ValueError("Trailing data after replay end marker")
+        return cls(seed, runs, end + gap)
+
+    @classmethod
+    def load(cls, path):
+        """Read and decode the replay file at path."""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def inputs(self):
+        """Yield the jump input for every tick of the run."""
+        tick = 0
+        for start, length in self.runs:
+            for _ in range(start - tick):
+                yield False
+            for _ in range(length):
+                yield True
+            tick = start + length
+        for _ in range(self.ticks - tick):
+            yield False
+
+    def play(self):
+        """Re-simulate the run headlessly and return the Simulation."""
+        sim = Simulation(seed=self.seed)
+        for jump in self.inputs():
+            if sim.game_over:
+                break
+            sim.step(jump)
+        return sim
+
+
+if __name__ == "__main__":
+    for replay_path in sys.argv[1:]:
+        result = Replay.load(replay_path).play()
+        print(
+            f"{replay_path}: {result.seconds_survived():.1f}s "
+            f"({result.ticks_survived} ticks, "
+            f"{'died' if result.game_over else 'alive'})"
+        )
@@ -0,0 +1,122 @@
+"""Batch entry point that runs many headless llama game episodes across a
+process pool and streams the results to a file."""
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import time
+from simulation import Simulation
+
+
+def never_jump(sim):
+    """Policy that never jumps."""
+    return False
+
+
+def always_jump(sim):
+    """Policy that jumps as soon as the llama lands."""
+    return True
+
+
+def jump_when_close(sim, distance=60):
+    """Policy that jumps when the next obstacle is within distance pixels."""
+    return sim.next_obstacle_distance() < distance
+
+
+POLICIES = {
+    "never": never_jump,
+    "always": always_jump,
+    "close": jump_when_close,
+}
+
+
+def load_policy(name):
+    """Return a policy by built-in name or as "module:function"."""
+    if name in POLICIES:
+        return POLICIES[name]
+    module_name, _, func_name = name.partition(":")
+    if not func_name:
+        raise ValueError(
+            f"Unknown policy {name!r}; use one of {sorted(POLICIES)} "
+            "or module:function"
+        )
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def run_episode(episode, seed, policy_name, max_ticks):
+    """Play one episode to the end (or max_ticks) and return its result."""
+    policy = load_policy(policy_name)
+    sim = Simulation(seed=seed)
+    while not sim.game_over and sim.ticks_survived < max_ticks:
+        sim.step(policy(sim))
+    hit = sim.hit_obstacle
+    return {
+        "episode": episode,
+        "seed": seed,
+        "seconds": round(sim.seconds_survived(), 3),
+        "ticks": sim.ticks_survived,
+        "obstacle_speed": round(sim.obstacle_speed, 2),
+        "death_obstacle": None if hit is None else {
+            "x": round(hit.x, 1), "size": hit.size
+        },
+    }
+
+
+def _run_episode(args):
+    """Unpack a task tuple for Pool.imap_unordered."""
+    return run_episode(*args)
+
+
+def run_episodes(episodes, seed, policy_name, max_ticks, output,
+                 workers=None):
+    """Run episodes across a process pool, writing one JSON line per
+    episode to output as each one finishes, and return the count."""
+    load_policy(policy_name)
+    tasks = [
+        (i, seed + i, policy_name, max_ticks) for i in range(episodes)
+    ]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, episodes // (workers * 16))
+    done = 0
+    with multiprocessing.Pool(workers) as pool, \
+            open(output, "w", encoding="utf-8") as f:
+        for result in pool.imap_unordered(_run_episode, tasks, chunksize):
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+            done += 1
+    return done
+
+
+def main():
+    """Parse command line arguments and run the batch."""
+    parser = argparse.ArgumentParser(
+        description="Run headless llama game episodes in parallel."
+    )
+    parser.add_argument("-n", "--episodes", type=int, default=1000)
+    parser.add_argument("-s", "--seed", type=int, default=0,
+                        help="seed of the first episode; episode i uses "
+                             "seed + i")
+    parser.add_argument("-p", "--policy", default="close",
+                        help="built-in policy name or module:function")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--max-ticks", type=int, default=60 * 60 * 10)
+    parser.add_argument("-o", "--output", default="episodes.jsonl")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    done = run_episodes(
+        args.episodes, args.seed, args.policy, args.max_ticks, args.output,
+        args.workers
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"{done} episodes in {elapsed:.1f}s "
+        f"({done / elapsed:.0f} episodes/s) -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
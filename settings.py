@@ -1,52 +1,130 @@
+"""Module containing the llama game's configuration: screen size, asset
+paths and the render-quality presets selectable from the command line.
+
+Physics and spawn constants live in simulation.py instead, because
+replays and high scores depend on them and must not change with a
+preset.
+"""
+
 # Screen dimensions
 SCREEN_WIDTH = 1000
-SCREEN_HEIGHT = 400
+SCREEN_HEIGHT = 720
+SCREEN_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
 FPS = 60
 
 # Colors
 WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
-GRAY = (83, 83, 83) # Color matching Chrome Dino game text
-
-# Player settings
-GRAVITY = 0.8
-JUMP_POWER = -15
-PLAYER_START_X = 50
-PLAYER_GROUND_Y = SCREEN_HEIGHT - 70 # Adjust based on ground/llama sprite height
-PLAYER_DUCK_Y = SCREEN_HEIGHT - 40  # Adjust for ducking sprite height
-
-# Game speed settings
-INITIAL_SPEED = 6
-SPEED_INCREASE_RATE = 0.001 # How much speed increases per frame/tick
-MAX_SPEED = 20
-
-# Ground settings
-GROUND_Y = SCREEN_HEIGHT - 50 # Top of the ground image
-
-# Obstacle settings
-OBSTACLE_MIN_GAP = 250  # Minimum pixels between obstacles
-OBSTACLE_MAX_GAP = 600  # Maximum pixels between obstacles
-BIRD_ALTITUDE_LOW = PLAYER_GROUND_Y - 30  # Y pos for low bird
-BIRD_ALTITUDE_HIGH = PLAYER_GROUND_Y - 70 # Y pos for high bird (needs ducking)
-
-# File Paths
-FONT_NAME = 'assets/fonts/pixel_font.ttf' # Example path
-HIGH_SCORE_FILE = 'high_score.txt'
-# ... add paths for all image assets ...
-LLAMA_RUN_IMGS = ['assets/images/llama/run1.png', 'assets/images/llama/run2.png']
-LLAMA_JUMP_IMG = 'assets/images/llama/jump.png'
-LLAMA_DUCK_IMGS = ['assets/images/llama/duck1.png', 'assets/images/llama/duck2.png']
-LLAMA_CRASH_IMG = 'assets/images/llama/crash.png'
-CACTUS_SMALL_IMGS = ['assets/images/obstacles/cactus_small1.png', ...]
-CACTUS_LARGE_IMGS = ['assets/images/obstacles/cactus_large1.png', ...]
-BIRD_IMGS = ['assets/images/obstacles/bird1.png', 'assets/images/obstacles/bird2.png']
-GROUND_IMG = 'assets/images/environment/ground.png'
-CLOUD_IMG = 'assets/images/environment/cloud.png'
-
-# Sound Paths (Optional)
-JUMP_SOUND = 'assets/sounds/jump.wav'
-SCORE_SOUND = 'assets/sounds/score_tick.wav'
-GAMEOVER_SOUND = 'assets/sounds/game_over.wav'
-
-# Custom Events (Optional, for timed actions like cloud spawning)
-ADD_CLOUD_EVENT = pygame.USEREVENT + 1
\ No newline at end of file
+YELLOW = (255, 255, 0)
+RED = (255, 0, 0)
+
+# File paths
+FONT_PATH = "assets/lemonmilk.ttf"
+BACKGROUND_PATH = "assets/ground.png"
+ICON_PATH = "assets/llama_icon.png"
+LLAMA_FRAME_PATHS = [
+    "assets/Llama.png",
+    "assets/Llama2.png",
+    "assets/Llama3.png",
+]
+CACTUS_PATH = "assets/cactus.png"
+PACK_PATH = "assets/assets.pack"
+REPLAY_DIR = "replays"
+REPLAY_KEEP = 200
+LEADERBOARD_PATH = "leaderboard.db"
+
+# Render-quality presets
+#   smooth_scaling  smoothscale the llama frames rather than nearest-neighbour
+#   vsync           wait for the display's vertical blank when flipping
+#   fps             target frame rate; 0 leaves the clock uncapped
+#   hud_hz          how many times a second the Time and Speed text redraws,
+#                   or 0 for every frame
+#   effects         antialiased text
+#   render_scale    internal render resolution as a fraction of the screen
+#                   size; the frame is scaled up to the window once
+#   integer_scaling only scale the frame up by whole multiples, with
+#                   black borders filling the rest of the window
+#   dirty_rects     during play, redraw and update only the areas that
+#                   changed instead of the whole frame
+PRESETS = {
+    "high": {
+        "smooth_scaling": True,
+        "vsync": False,
+        "fps": FPS,
+        "hud_hz": 0,
+        "effects": True,
+        "render_scale": 1.0,
+        "integer_scaling": False,
+        "dirty_rects": True,
+    },
+    "medium": {
+        "smooth_scaling": True,
+        "vsync": False,
+        "fps": FPS,
+        "hud_hz": 10,
+        "effects": True,
+        "render_scale": 0.5,
+        "integer_scaling": False,
+        "dirty_rects": True,
+    },
+    "low": {
+        "smooth_scaling": False,
+        "vsync": False,
+        "fps": 30,
+        "hud_hz": 5,
+        "effects": False,
+        "render_scale": 0.5,
+        "integer_scaling": False,
+        "dirty_rects": True,
+    },
+}
+DEFAULT_PRESET = "high"
+
+# Window settings, which no preset changes
+WINDOW_DEFAULTS = {
+    "window_size": SCREEN_SIZE,
+    "fullscreen": False,
+}
+
+
+class Settings:
+    """The quality settings in effect: a preset with any individual values
+    overridden."""
+    def __init__(self, preset=DEFAULT_PRESET, **overrides):
+        """Start from the named preset and apply the overrides that are not
+        None, raising KeyError for an unknown preset or setting."""
+        values = dict(WINDOW_DEFAULTS)
+        values.update(PRESETS[preset])
+        for name, value in overrides.items():
+            if name not in values:
+                raise KeyError(name)
+            if value is not None:
+                values[name] = value
+        self.preset = preset
+        self.smooth_scaling = values["smooth_scaling"]
+        self.vsync = values["vsync"]
+        self.fps = values["fps"]
+        self.hud_hz = values["hud_hz"]
+        self.effects = values["effects"]
+        self.render_scale = values["render_scale"]
+        self.integer_scaling = values["integer_scaling"]
+        self.dirty_rects = values["dirty_rects"]
+        self.window_size = values["window_size"]
+        self.fullscreen = values["fullscreen"]
+
+    def render_size(self):
+        """Return the size of the surface frames are drawn on."""
+        return (
+            round(SCREEN_WIDTH * self.render_scale),
+            round(SCREEN_HEIGHT * self.render_scale)
+        )
+
+
+current = Settings()
+
+
+def use_preset(preset=DEFAULT_PRESET, **overrides):
+    """Make a preset, with overrides, the current settings and return it.
+    Call this before creating the Game."""
+    global current
+    current = Settings(preset, **overrides)
+    return current
@@ -0,0 +1,351 @@
+"""Module containing the pygame-free simulation core for the llama game."""
+
+import random
+
+GROUND_Y = 345
+LLAMA_SIZE = 80
+LLAMA_FRAME_COUNT = 3
+OBSTACLE_BASE_SIZE = 50
+OBSTACLE_FLOOR = 425
+OBSTACLE_SCALES = [1, 0.9, 0.8, 0.7, 0.6]
+SPAWN_X = 1000
+TICKS_PER_SECOND = 60
+
+
+class LlamaBody:
+    """Represents the llama's physics and animation counters without any
+    images, so it can be stepped without a display."""
+    def __init__(self, x, y):
+        """Initialize the llama with position, physics, and frame counters."""
+        self.x = x
+        self.y = GROUND_Y
+        self.prev_y = self.y
+        self.velocity = 0
+        self.is_jumping = False
+        self.gravity = 1
+        self.jump_strength = -15
+        self.frame_count = LLAMA_FRAME_COUNT
+        self.current_frame = 0
+        self.frame_counter = 0
+        self.frame_delay = 5
+
+    def jump(self):
+        """Make the llama jump if it is not already jumping."""
+        if not self.is_jumping:
+            self.is_jumping = True
+            self.velocity = self.jump_strength
+
+    def update(self):
+        """Update the llama's position, velocity, and animation frame."""
+        self.prev_y = self.y
+        if self.is_jumping:
+            self.velocity += self.gravity
+            self.y += self.velocity
+            if self.y >= GROUND_Y:
+                self.y = GROUND_Y
+                self.is_jumping = False
+        self.frame_counter += 1
+        if self.frame_counter >= self.frame_delay:
+            self.frame_counter = 0
+            self.current_frame = (self.current_frame + 1) % self.frame_count
+
+    def hitbox(self):
+        """Return the llama's collision hitbox as (x, y, width, height)."""
+        margin = 0.3
+        shrink_w = int(LLAMA_SIZE * margin)
+        shrink_h = int(LLAMA_SIZE * margin)
+        return (
+            int(self.x + shrink_w // 2),
+            int(self.y + shrink_h // 2),
+            LLAMA_SIZE - shrink_w,
+            LLAMA_SIZE - shrink_h
+        )
+
+
+class ObstacleBody:
+    """Represents an obstacle's position, size and movement without any
+    images, so it can be stepped without a display."""
+    __slots__ = ("size", "x", "prev_x", "y", "speed")
+
+    def __init__(self, x, y, scale=0.8, speed=5):
+        """Initialize an obstacle with position, size, and movement speed."""
+        self.reset(x, y, scale, speed)
+
+    def reset(self, x, y, scale=0.8, speed=5):
+        """Reinitialize the obstacle so a pooled record can be reused."""
+        size = int(OBSTACLE_BASE_SIZE * scale)
+        self.size = size
+        self.x = x
+        self.prev_x = x
+        self.y = OBSTACLE_FLOOR - size
+        self.speed = speed
+
+    def update(self):
+        """Update the obstacle position by moving it to the left."""
+        self.prev_x = self.x
+        self.x -= self.speed
+
+    def hitbox(self):
+        """Return the obstacle's collision hitbox as (x, y, width, height)."""
+        margin = 0.5
+        shrink = int(self.size * margin)
+        return (
+            int(self.x + shrink // 2),
+            int(self.y + shrink // 2),
+            self.size - shrink,
+            self.size - shrink
+        )
+
+
+class ObstaclePool:
+    """Ring buffer of preallocated obstacle records ordered by x.
+
+    Obstacles are always spawned to the right of the last one and all move
+    at the same speed, so the live records stay sorted: culling advances
+    the head, the rightmost obstacle is the tail, and spawning reuses the
+    slot after the tail. Neighbours are always further apart than any two
+    obstacle sizes differ, so only the head can be ready to cull. The
+    buffer only grows if it is ever full.
+
+    passed counts the live obstacles, from the head, that are already
+    fully behind the llama and can be skipped by collision checks.
+    """
+    def __init__(self, factory, capacity=16):
+        """Preallocate capacity records using the obstacle factory."""
+        self.factory = factory
+        self.slots = [factory(0, 0, 1, 0) for _ in range(capacity)]
+        self.head = 0
+        self.count = 0
+        self.passed = 0
+
+    def __len__(self):
+        """Return the number of live obstacles."""
+        return self.count
+
+    def __iter__(self):
+        """Yield the live obstacles from left to right."""
+        slots = self.slots
+        capacity = len(slots)
+        for i in range(self.count):
+            yield slots[(self.head + i) % capacity]
+
+    def clear(self):
+        """Mark every record as free."""
+        self.head = 0
+        self.count = 0
+        self.passed = 0
+
+    def spawn(self, x, y, scale, speed):
+        """Reuse the next free record for a new obstacle and return it."""
+        if self.count == len(self.slots):
+            self.grow()
+        slots = self.slots
+        o = slots[(self.head + self.count) % len(slots)]
+        o.reset(x, y, scale, speed)
+        self.count += 1
+        return o
+
+    def grow(self):
+        """Double the capacity of a full pool, keeping the live records in
+        order."""
+        spare = [self.factory(0, 0, 1, 0) for _ in range(len(self.slots))]
+        self.slots = list(self) + spare
+        self.head = 0
+
+    def cull(self):
+        """Free obstacles that have moved fully off the left edge."""
+        slots = self.slots
+        capacity = len(slots)
+        while self.count:
+            o = slots[self.head]
+            if o.x > -o.size:
+                break
+            self.head = (self.head + 1) % capacity
+            self.count -= 1
+            if self.passed:
+                self.passed -= 1
+
+    def last(self):
+        """Return the rightmost obstacle, or None if there are none."""
+        if not self.count:
+            return None
+        slots = self.slots
+        return slots[(self.head + self.count - 1) % len(slots)]
+
+
+class Simulation:
+    """Steps the llama game rules (physics, spawning, difficulty ramping and
+    collision) one tick at a time without a display, fonts or images."""
+    def __init__(self, rng=None, llama_factory=LlamaBody,
+                 obstacle_factory=ObstacleBody, seed=None):
+        """Initialize the simulation with its own random source (seeded with
+        seed if given) and the classes used to create the llama and
+        obstacles."""
+        self.rng = rng if rng is not None else random.Random()
+        self.llama_factory = llama_factory
+        self.obstacle_factory = obstacle_factory
+        self.obstacles = ObstaclePool(obstacle_factory)
+        self.profiler = None
+        self.seed = None
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Reset the run state to the start of a new game, reseeding the
+        random source first if a seed is given."""
+        if seed is not None:
+            self.rng.seed(seed)
+        self.seed = seed
+        self.llama = self.llama_factory(200, 500)
+        self.obstacles.clear()
+        for i in range(2):
+            self.obstacles.spawn(
+                SPAWN_X + i * 300, 0, self.rng.choice(OBSTACLE_SCALES), 5
+            )
+        self.game_over = False
+        self.hit_obstacle = None
+        self.final_seconds = 0.0
+        self.ticks_survived = 0
+        self.spawn_timer = 0
+        self.spawn_interval = 120
+        self.min_spawn_interval = 40
+        self.obstacle_speed = 5
+        self.max_obstacle_speed = 11
+        self.difficulty_timer = 0
+
+    def step(self, jump=False):
+        """Advance the game by one tick and return True if the llama hit an
+        obstacle during it.
+
+        If a profiler is attached, each phase of the tick is marked on it.
+        """
+        prof = self.profiler
+        if jump:
+            self.llama.jump()
+        self.llama.update()
+        if prof is not None:
+            prof.mark("llama update")
+        pool = self.obstacles
+        slots = pool.slots
+        capacity = len(slots)
+        for i in range(pool.count):
+            slots[(pool.head + i) % capacity].update()
+        pool.cull()
+        if prof is not None:
+            prof.mark("obstacle update")
+
+        self.difficulty_timer += 1
+        if self.difficulty_timer % 90 == 0:
+            self.ramp_difficulty()
+
+        self.spawn_timer += 1
+        if self.spawn_timer >= self.spawn_interval:
+            self.spawn_timer = 0
+            self.spawn_obstacles()
+        if prof is not None:
+            prof.mark("spawn")
+
+        hit = self.check_collision()
+        if hit is not None:
+            self.game_over = True
+            self.hit_obstacle = hit
+            self.final_seconds = round(
+                self.ticks_survived / TICKS_PER_SECOND, 1
+            )
+        self.ticks_survived += 1
+        if prof is not None:
+            prof.mark("collision")
+        return hit is not None
+
+    def ramp_difficulty(self):
+        """Shorten the spawn interval and speed up every obstacle."""
+        if self.spawn_interval > self.min_spawn_interval:
+            self.spawn_interval -= 2
+        if self.obstacle_speed < self.max_obstacle_speed:
+            self.obstacle_speed = min(
+                self.obstacle_speed + 0.4, self.max_obstacle_speed
+            )
+        pool = self.obstacles
+        slots = pool.slots
+        capacity = len(slots)
+        for i in range(pool.count):
+            slots[(pool.head + i) % capacity].speed = self.obstacle_speed
+
+    def spawn_obstacles(self):
+        """Spawn a single obstacle or a group of obstacles off screen."""
+        rng = self.rng
+        min_jump_gap = 220
+        last = self.obstacles.last()
+        last_x = last.x if last is not None else 0
+        group_chance = rng.random()
+        if group_chance < 0.25:
+            group_size = rng.randint(2, 4)
+            base_x = max(SPAWN_X, last_x + min_jump_gap)
+            scale = rng.choice(OBSTACLE_SCALES)
+            jump_distance = 180
+            min_gap = int(jump_distance + 30 * scale)
+            max_gap = min_gap + 60
+            group_y = rng.choice([0, 20, 40, 60])
+            for i in range(group_size):
+                gap = rng.randint(min_gap, max_gap)
+                x = base_x + i * gap
+                y = group_y + rng.choice([0, 10, 20])
+                self.obstacles.spawn(x, y, scale, self.obstacle_speed)
+        else:
+            scale = rng.choice(OBSTACLE_SCALES)
+            y = rng.choice([0, 10, 20, 30, 40, 50, 60])
+            spawn_x = max(SPAWN_X, last_x + min_jump_gap)
+            self.obstacles.spawn(spawn_x, y, scale, self.obstacle_speed)
+        variation = rng.randint(-20, 20)
+        self.spawn_interval = max(
+            self.min_spawn_interval, self.spawn_interval + variation
+        )
+
+    def check_collision(self):
+        """Return the first obstacle overlapping the llama, or None."""
+        # The hitbox overlap test (pygame.Rect.colliderect) is unrolled so
+        # a tick allocates no tuples or Rects.
+        llama = self.llama
+        margin = int(LLAMA_SIZE * 0.3)
+        left = int(llama.x + margin // 2)
+        top = int(llama.y + margin // 2)
+        right = left + LLAMA_SIZE - margin
+        bottom = top + LLAMA_SIZE - margin
+        pool = self.obstacles
+        slots = pool.slots
+        capacity = len(slots)
+        count = pool.count
+        # The llama never moves sideways and obstacles stay sorted by x, so
+        # only a window of obstacles around its column needs testing: skip
+        # the ones already behind it and stop at the first one past it.
+        i = pool.passed
+        while i < count:
+            o = slots[(pool.head + i) % capacity]
+            if o.x + o.size > left:
+                break
+            i += 1
+        pool.passed = i
+        while i < count:
+            o = slots[(pool.head + i) % capacity]
+            if o.x >= right:
+                break
+            shrink = o.size // 2
+            box = o.size - shrink
+            x = int(o.x + shrink // 2)
+            y = o.y + shrink // 2
+            if left < x + box and x < right and top < y + box and y < bottom:
+                return o
+            i += 1
+        return None
+
+    def next_obstacle_distance(self):
+        """Return the distance from the llama's hitbox to the nearest
+        obstacle that has not yet passed it, or inf if there is none."""
+        llama_left = int(self.llama.x + int(LLAMA_SIZE * 0.3) // 2)
+        for o in self.obstacles:
+            if o.x + o.size > llama_left:
+                return o.x - llama_left
+        return float("inf")
+
+    def seconds_survived(self):
+        """Return the number of seconds survived so far."""
+        return self.ticks_survived / TICKS_PER_SECOND
@@ -0,0 +1,90 @@
+"""Module for verifying llama game replays by re-simulating them headlessly
+at full speed, singly or in parallel batches."""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from replay import Replay
+
+
+def verify_replay(data, claimed_seconds=None):
+    """Re-simulate the replay in data and return the seconds it really
+    survived, or None if it is malformed, does not end in a collision on
+    its final tick, or does not match claimed_seconds."""
+    try:
+        replay = Replay.from_bytes(data)
+    except ValueError:
+        return None
+    sim = replay.play()
+    if not sim.game_over or sim.ticks_survived != replay.ticks:
+        return None
+    if (claimed_seconds is not None
+            and round(claimed_seconds, 1) != sim.final_seconds):
+        return None
+    return sim.final_seconds
+
+
+def verify_file(task):
+    """Verify a (path, claimed_seconds) task and return (path, claimed,
+    verified seconds or None)."""
+    path, claimed = task
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except IOError:
+        return path, claimed, None
+    return path, claimed, verify_replay(data, claimed)
+
+
+def verify_batch(tasks, workers=None):
+    """Verify (path, claimed_seconds) tasks across a process pool, yielding
+    results as they finish."""
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 16))
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(verify_file, tasks, chunksize)
+
+
+def main():
+    """Parse command line arguments and verify the given replays."""
+    parser = argparse.ArgumentParser(
+        description="Verify llama game replays by re-simulating them."
+    )
+    parser.add_argument("replays", nargs="*",
+                        help="replay files to verify without a claim")
+    parser.add_argument("--submissions",
+                        help="JSON lines file of "
+                             '{"replay": path, "seconds": claimed}')
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only print rejected replays and the summary")
+    args = parser.parse_args()
+
+    tasks = [(path, None) for path in args.replays]
+    if args.submissions:
+        with open(args.submissions, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    tasks.append((entry["replay"], entry["seconds"]))
+
+    start = time.perf_counter()
+    rejected = 0
+    for path, claimed, verified in verify_batch(tasks, args.workers):
+        if verified is None:
+            rejected += 1
+            print(f"REJECTED {path} (claimed {claimed})")
+        elif not args.quiet:
+            print(f"OK       {path} {verified:.1f}s")
+    elapsed = time.perf_counter() - start
+    print(
+        f"{len(tasks)} replays, {rejected} rejected in {elapsed:.2f}s "
+        f"({len(tasks) / elapsed:.0f} replays/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()